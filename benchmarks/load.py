@@ -0,0 +1,371 @@
+"""Drive concurrent dashboard sessions through app.py offline and report rerun latency, peak RSS and cache hit rate.
+
+    python -m benchmarks.load --sessions 20 --rows 100000 --players 10
+    python -m benchmarks.load --sessions 50 --reruns 20 --refresh-every 5 --append 50 --json load.json
+
+Every session is a Streamlit ``AppTest`` running on its own thread in this
+process, so they share ``st.cache_data``/``st.cache_resource`` and the sheet
+refresher the way sessions on one server do. The sheet is a synthetic
+``FakeWorksheet`` and snapshots go to a temporary directory, so nothing
+touches the network or the working tree. Linux only: RSS is read from /proc.
+
+It also reports what each session's frame costs: the memory held by one
+refresher view per session, by those views once every session has written
+a column, and by a deep copy per session instead.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import FakeWorksheet, generate_responses
+from tracker.refresher import BackgroundRefresher
+from tracker.schema import normalize
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+REFRESH_LABEL = "Refresh Data"
+
+
+class FakeClient:
+    """Stands in for an authorized gspread client; every sheet and tab is the same worksheet."""
+
+    def __init__(self, worksheet):
+        self.worksheet_ = worksheet
+
+    def open_by_key(self, key):
+        return self
+
+    def worksheet(self, name):
+        return self.worksheet_
+
+
+class CacheCounter:
+    """Counts hits and misses per cached function across every session.
+
+    A session that misses while another is computing the same value waits
+    for it and is served from the cache; that counts as a hit and a wait.
+    """
+
+    def __init__(self):
+        self.hits = Counter()
+        self.misses = Counter()
+        self.waits = Counter()
+        self._lock = threading.Lock()
+
+    def count(self, counter, cached):
+        name = getattr(cached._info.func, "__qualname__", "?")
+        with self._lock:
+            counter[name] += 1
+
+    def hit_rate(self):
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return hits / (hits + misses) if hits + misses else None
+
+
+def _rss_mb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+@contextmanager
+def patched_streamlit(worksheet, counter):
+    """Point the app at ``worksheet``, count cache lookups and make AppTest safe to run on several threads.
+
+    ``AppTest`` installs a mock ``Runtime`` for the length of each run and
+    clears it afterwards, which would pull it out from under every other
+    session mid-run; ``Runtime.instance()`` keeps serving the last one set.
+    Each run also compiles the script afresh, and parsing on several threads
+    at once trips up CPython 3.11, so compiles take turns.
+    """
+    import streamlit as st
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.cache_utils import CachedFunc
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.runtime.secrets import Secrets
+
+    import tracker.sheets
+
+    last = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+        elif last:
+            return last[0]
+        return original_instance.__func__(cls)
+
+    def exists(cls):
+        return cls._instance is not None or bool(last)
+
+    compile_lock = threading.Lock()
+
+    def get_bytecode(self, script_path):
+        with compile_lock:
+            return original_get_bytecode(self, script_path)
+
+    computing = threading.local()
+
+    def handle_hit(self, result):
+        stack = getattr(computing, "stack", None)
+        if stack and stack[-1] is self:
+            stack[-1] = None
+            counter.count(counter.waits, self)
+        counter.count(counter.hits, self)
+        return original_hit(self, result)
+
+    def handle_miss(self, *args, **kwargs):
+        # Streamlit re-reads the cache under the value's lock, so a miss can still end in a hit.
+        stack = computing.__dict__.setdefault("stack", [])
+        stack.append(self)
+        try:
+            return original_miss(self, *args, **kwargs)
+        finally:
+            if stack.pop() is self:
+                counter.count(counter.misses, self)
+
+    original_instance, original_exists = Runtime.__dict__["instance"], Runtime.__dict__["exists"]
+    original_hit, original_miss = CachedFunc._handle_cache_hit, CachedFunc._handle_cache_miss
+    original_get_bytecode = ScriptCache.get_bytecode
+    original_authorize, original_secrets = tracker.sheets.authorize, st.secrets
+    secrets = Secrets()
+    secrets._secrets = {"gcp_service_account": {}}
+
+    Runtime.instance, Runtime.exists = classmethod(instance), classmethod(exists)
+    CachedFunc._handle_cache_hit, CachedFunc._handle_cache_miss = handle_hit, handle_miss
+    ScriptCache.get_bytecode = get_bytecode
+    tracker.sheets.authorize = lambda info: FakeClient(worksheet)
+    st.secrets = secrets
+    try:
+        yield
+    finally:
+        Runtime.instance, Runtime.exists = original_instance, original_exists
+        CachedFunc._handle_cache_hit, CachedFunc._handle_cache_miss = original_hit, original_miss
+        ScriptCache.get_bytecode = original_get_bytecode
+        tracker.sheets.authorize = original_authorize
+        st.secrets = original_secrets
+
+
+@contextmanager
+def captured_profiles(runs):
+    """Collect the dashboard's per-run profile lines into ``runs`` instead of printing them."""
+    from tracker.profiling import logger as profile_logger
+
+    # Streamlit's loggers don't propagate, and it resets their levels whenever
+    # AppTest patches the config, so each one gets a filter instead.
+    streamlit_loggers = [
+        logging.getLogger(name) for name in list(logging.root.manager.loggerDict)
+        if name == "streamlit" or name.startswith("streamlit.")
+    ]
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            runs.append(json.loads(record.getMessage()))
+
+    def errors_only(record):
+        return record.levelno >= logging.ERROR
+
+    handlers = profile_logger.handlers[:]
+    profile_logger.handlers = [Collect()]
+    for logger in streamlit_loggers:
+        logger.addFilter(errors_only)
+    try:
+        yield
+    finally:
+        profile_logger.handlers = handlers
+        for logger in streamlit_loggers:
+            logger.removeFilter(errors_only)
+
+
+def run_session(number, args, worksheet, results, stop):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(args.seed + number)
+    at = AppTest.from_file(APP, default_timeout=args.timeout)
+    for rerun in range(args.reruns):
+        if stop.is_set():
+            return
+        kind = "initial" if rerun == 0 else "rerun"
+        refresh = [button for button in at.button if button.label == REFRESH_LABEL] if rerun else []
+        if refresh and args.refresh_every and rng.random() < 1 / args.refresh_every:
+            kind = "refresh"
+            if args.append:
+                worksheet.append(generate_responses(args.append, players=args.players, seed=rng.randrange(2**32)))
+            refresh[0].click()
+
+        start = time.perf_counter()
+        try:
+            at.run()
+            error = str(at.exception[0].value) if at.exception else None
+        except Exception as exc:
+            error = repr(exc)
+        results.append({"session": number, "kind": kind, "seconds": time.perf_counter() - start, "error": error})
+        if error and args.fail_fast:
+            stop.set()
+        if args.think:
+            time.sleep(rng.uniform(0, 2 * args.think))
+
+
+def _percentiles(seconds):
+    if not seconds:
+        return {"runs": 0, "p50_ms": None, "p95_ms": None, "max_ms": None}
+    p50, p95 = np.percentile(seconds, [50, 95]) * 1000
+    return {"runs": len(seconds), "p50_ms": round(p50, 1), "p95_ms": round(p95, 1), "max_ms": round(max(seconds) * 1000, 1)}
+
+
+def _section_medians(profiles):
+    sections = {}
+    for profile in profiles:
+        for name, ms in profile["sections_ms"].items():
+            sections.setdefault(name, []).append(ms)
+    medians = {name: round(float(np.median(values)), 1) for name, values in sections.items()}
+    return dict(sorted(medians.items(), key=lambda item: item[1], reverse=True))
+
+
+def _traced_mb(make, count):
+    tracemalloc.start()
+    try:
+        frames = [make() for _ in range(count)]
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del frames
+    return round(allocated / 2**20, 1)
+
+
+def session_frames(df, sessions):
+    """MB allocated for ``sessions`` readers of ``df``: refresher views, views after a column write, and deep copies."""
+    refresher = BackgroundRefresher(lambda: df)
+
+    def written_view():
+        view = refresher.current().df
+        view["ounces"] = view["ounces"] * 2
+        return view
+
+    return {
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 2**20, 1),
+        "views_mb": _traced_mb(lambda: refresher.current().df, sessions),
+        "written_views_mb": _traced_mb(written_view, sessions),
+        "deep_copies_mb": _traced_mb(df.copy, sessions)
+    }
+
+
+def load_test(args):
+    worksheet = FakeWorksheet(generate_responses(args.rows, players=args.players, seed=args.seed))
+    counter = CacheCounter()
+    results, profiles = [], []
+    stop = threading.Event()
+    frames = session_frames(normalize(pd.DataFrame(worksheet.rows, columns=worksheet.header)), args.sessions)
+    start_rss = _rss_mb("VmRSS")
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as workdir, patched_streamlit(worksheet, counter), captured_profiles(profiles):
+        # The app keeps its snapshots in a relative .cache directory.
+        os.chdir(workdir)
+        try:
+            started = time.perf_counter()
+            threads = []
+            for number in range(args.sessions):
+                thread = threading.Thread(target=run_session, args=(number, args, worksheet, results, stop), name=f"session-{number}")
+                thread.start()
+                threads.append(thread)
+                if args.ramp:
+                    time.sleep(args.ramp / args.sessions)
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            os.chdir(cwd)
+
+    kinds = sorted({result["kind"] for result in results})
+    hit_rate = counter.hit_rate()
+    return {
+        "sessions": args.sessions,
+        "rows": args.rows,
+        "players": args.players,
+        "seconds": round(elapsed, 2),
+        "latency": {
+            "all": _percentiles([result["seconds"] for result in results]),
+            **{kind: _percentiles([result["seconds"] for result in results if result["kind"] == kind]) for kind in kinds}
+        },
+        "start_rss_mb": round(start_rss, 1),
+        "peak_rss_mb": round(_rss_mb("VmHWM"), 1),
+        "session_frames": frames,
+        "cache_hit_rate": round(hit_rate, 4) if hit_rate is not None else None,
+        "cache_hits": dict(counter.hits),
+        "cache_misses": dict(counter.misses),
+        "cache_waits": dict(counter.waits),
+        "profiled_runs": len(profiles),
+        "sections_p50_ms": _section_medians(profiles),
+        "sheet_requests": worksheet.requests,
+        "errors": [result for result in results if result["error"]]
+    }
+
+
+def report(summary):
+    print(
+        f"{summary['sessions']} sessions on {summary['rows']:,} rows × {summary['players']} players "
+        f"in {summary['seconds']:.1f} s, {summary['sheet_requests']} sheet requests"
+    )
+    for kind, stats in summary["latency"].items():
+        if stats["runs"]:
+            print(f"  {kind:<10}{stats['runs']:>6} runs  p50 {stats['p50_ms']:>9.1f} ms  p95 {stats['p95_ms']:>9.1f} ms  max {stats['max_ms']:>9.1f} ms")
+    slowest = list(summary["sections_p50_ms"].items())[:5]
+    if slowest:
+        print("  slowest   " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in slowest) + " (p50 per section)")
+    print(f"  RSS       {summary['start_rss_mb']:.1f} MB at start, {summary['peak_rss_mb']:.1f} MB peak")
+    frames = summary["session_frames"]
+    print(
+        f"  frames    {frames['frame_mb']:.1f} MB shared; {summary['sessions']} sessions hold {frames['views_mb']:.1f} MB as views, "
+        f"{frames['written_views_mb']:.1f} MB after each writes a column, {frames['deep_copies_mb']:.1f} MB as deep copies"
+    )
+    rate = summary["cache_hit_rate"]
+    print(f"  cache     {'n/a' if rate is None else f'{rate:.1%}'} hit rate over {sum(summary['cache_hits'].values()) + sum(summary['cache_misses'].values())} lookups")
+    for name in sorted(summary["cache_misses"], key=summary["cache_misses"].get, reverse=True):
+        print(
+            f"    {name:<28}{summary['cache_misses'][name]:>6} misses  {summary['cache_hits'].get(name, 0):>6} hits"
+            f"  {summary['cache_waits'].get(name, 0):>6} waited on another session"
+        )
+    if summary["errors"]:
+        print(f"  {len(summary['errors'])} runs failed, first: {summary['errors'][0]['error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--players", type=int, default=10)
+    parser.add_argument("--reruns", type=int, default=10, help="script runs per session, the first included")
+    parser.add_argument("--refresh-every", type=float, default=5, help="click Refresh Data on about one rerun in this many (0 never does)")
+    parser.add_argument("--append", type=int, default=0, help="rows added to the sheet before each refresh click")
+    parser.add_argument("--think", type=float, default=0, help="mean seconds a session waits between reruns")
+    parser.add_argument("--ramp", type=float, default=0, help="seconds over which sessions are started")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds a single run may take")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fail-fast", action="store_true", help="stop every session after the first failed run")
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    summary = load_test(args)
+    report(summary)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
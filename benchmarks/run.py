@@ -0,0 +1,136 @@
+"""Time and memory-profile the compute stages on synthetic form responses.
+
+    python -m benchmarks.run --rows 1000 100000 1000000 --players 20
+    python -m benchmarks.run --save-baseline
+    python -m benchmarks.run            # exits 1 if a stage regressed past --tolerance, 2 with no baseline to check
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+from benchmarks.synthetic import generate_responses
+from tracker.aggregates import dashboard_aggregates, leaderboard
+from tracker.cube import DrinkCube
+from tracker.forecast import forecast_year_end
+from tracker.heatmap import season_heatmaps
+from tracker.schema import normalize
+from tracker.stats import compute_streaks, player_summary
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+SEASON = 2026
+
+# Each stage gets the raw responses, the normalized frame and a fresh cube of the season, built
+# outside the timing: the dashboard builds its cube once per data version and shares it.
+STAGES = {
+    "normalize": lambda raw, df, cube: normalize(raw.copy()),
+    "leaderboard": lambda raw, df, cube: leaderboard(df),
+    "cube": lambda raw, df, cube: DrinkCube(df, SEASON),
+    "aggregates": lambda raw, df, cube: dashboard_aggregates(df, goal_ounces=5000, cube=cube),
+    "streaks": lambda raw, df, cube: compute_streaks(df, date(SEASON, 12, 31)),
+    "forecast": lambda raw, df, cube: forecast_year_end(df, date(SEASON, 12, 31), SEASON),
+    "player_summary": lambda raw, df, cube: player_summary(df, today=date(SEASON, 12, 31), year=SEASON, cube=cube),
+    "heatmaps": lambda raw, df, cube: season_heatmaps(cube, dict.fromkeys(cube.people, "#E61A27"), SEASON)
+}
+
+
+def measure(stage, raw, df, repeat, memory):
+    timings = []
+    for _ in range(repeat):
+        # A new cube each time, so a stage never reads sums cached by the run before.
+        cube = DrinkCube(df, SEASON)
+        start = time.perf_counter()
+        stage(raw, df, cube)
+        timings.append(time.perf_counter() - start)
+
+    peak_mb = None
+    if memory:
+        cube = DrinkCube(df, SEASON)
+        tracemalloc.start()
+        stage(raw, df, cube)
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+
+    return {"seconds": min(timings), "peak_mb": peak_mb}
+
+
+def run(rows_list, players, repeat, memory, stages):
+    results = {}
+    for rows in rows_list:
+        raw = generate_responses(rows, players=players)
+        df = normalize(raw.copy())
+        frame_mb = df.memory_usage(deep=True).sum() / 1e6
+        for name in stages:
+            key = f"{name}@{rows}"
+            results[key] = measure(STAGES[name], raw, df, repeat, memory)
+            results[key]["frame_mb"] = frame_mb
+            peak = results[key]["peak_mb"]
+            print(
+                f"{name:<16}{rows:>10,} rows  {results[key]['seconds'] * 1000:>10.1f} ms"
+                + (f"  {peak:>9.1f} MB peak" if peak is not None else ""),
+                flush=True
+            )
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        if result["seconds"] > previous["seconds"] * (1 + tolerance):
+            regressions.append(f"{key}: {previous['seconds'] * 1000:.1f} ms -> {result['seconds'] * 1000:.1f} ms")
+        if result["peak_mb"] and previous.get("peak_mb") and result["peak_mb"] > previous["peak_mb"] * (1 + tolerance):
+            regressions.append(f"{key}: {previous['peak_mb']:.1f} MB -> {result['peak_mb']:.1f} MB peak")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--players", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stage", action="append", choices=sorted(STAGES), help="only run these stages")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging, as a fraction")
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.players, args.repeat, not args.no_memory, args.stage or list(STAGES))
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline on this machine first.")
+        return 2
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    unmatched = [key for key in results if key not in baseline]
+    if len(unmatched) == len(results):
+        print(f"{args.baseline} has none of these stages and sizes; run with --save-baseline to add them.")
+        return 2
+    for key in unmatched:
+        print(f"NO BASELINE {key}")
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
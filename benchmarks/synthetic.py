@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+FORM_HEADER = [
+    "Timestamp",
+    "Who are you",
+    "DC or inferior product?",
+    "Date & time",
+    "Format",
+    "Ounces",
+    "Additional notes?",
+    "AM only: is this the first beverage you've had today?"
+]
+
+DRINK_TYPES = ["Diet Coke", "Coke Zero", "Pepsi Zero", "Diet Dr Pepper"]
+DRINK_WEIGHTS = [0.7, 0.15, 0.1, 0.05]
+FORMATS = ["Can", "Bottle", "Fountain", "Glass bottle"]
+OUNCES = ["12", "20", "16.9", "32 oz", "8", ""]
+NOTES = ["", "", "", "morning meeting", "lunch", "road trip", "needed this", "free refill"]
+FIRST_BEVERAGE = ["Yes", "No", ""]
+DATETIME_FORMAT = "%m/%d/%Y %H:%M:%S"
+
+
+def player_names(players):
+    base = ["Cain", "Shiv"]
+    return base[:players] + [f"Player {i}" for i in range(len(base) + 1, players + 1)]
+
+
+def generate_responses(rows, players=2, seed=0, start="2026-01-01", days=365):
+    """Form responses shaped like the "Form Responses 1" sheet, as the strings the Sheets API returns."""
+    rng = np.random.default_rng(seed)
+    names = np.array(player_names(players))
+
+    # Drinks cluster in waking hours; offsets are sorted so rows arrive in submission order.
+    day = rng.integers(0, days, rows)
+    hour = np.clip(rng.normal(13, 4, rows), 6, 23.99)
+    offsets = np.sort(day * 86400 + (hour * 3600).astype(np.int64))
+    logged = pd.Timestamp(start) + pd.to_timedelta(offsets, unit="s")
+    submitted = logged + pd.to_timedelta(rng.integers(0, 3600, rows), unit="s")
+
+    return pd.DataFrame({
+        "Timestamp": submitted.strftime(DATETIME_FORMAT),
+        "Who are you": names[rng.integers(0, players, rows)],
+        "DC or inferior product?": rng.choice(DRINK_TYPES, rows, p=DRINK_WEIGHTS),
+        "Date & time": logged.strftime(DATETIME_FORMAT),
+        "Format": rng.choice(FORMATS, rows),
+        "Ounces": rng.choice(OUNCES, rows),
+        "Additional notes?": rng.choice(NOTES, rows),
+        "AM only: is this the first beverage you've had today?": rng.choice(FIRST_BEVERAGE, rows)
+    }, columns=FORM_HEADER)
+
+
+class FakeWorksheet:
+    """In-memory stand-in for a gspread worksheet, serving ``row_values`` and ``get_values`` from a frame."""
+
+    def __init__(self, responses):
+        self.header = list(responses.columns)
+        self.rows = responses.astype(str).values.tolist()
+        self.requests = 0
+
+    def append(self, responses):
+        self.rows.extend(responses.astype(str).values.tolist())
+
+    def row_values(self, row):
+        self.requests += 1
+        return list(self.header) if row == 1 else list(self.rows[row - 2])
+
+    def get_values(self, range_name=None, **kwargs):
+        self.requests += 1
+        start, _, end = range_name.partition(":")
+        first = int("".join(ch for ch in start if ch.isdigit()) or 1)
+        last = "".join(ch for ch in end if ch.isdigit())
+        last = int(last) if last else len(self.rows) + 1
+        table = [self.header] + self.rows
+        return [list(row) for row in table[first - 1:last]]
@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+import pytest
+
+from benchmarks.synthetic import FakeWorksheet, generate_responses
+
+SHEETS_HOST = "https://sheets.googleapis.com"
+ERROR_STATUSES = {400: "INVALID_ARGUMENT", 403: "PERMISSION_DENIED", 429: "RESOURCE_EXHAUSTED", 503: "UNAVAILABLE"}
+
+
+class FakeSheetsServer:
+    """A local HTTP stand-in for the Sheets v4 API, serving one worksheet to a real gspread client.
+
+    Values come from a ``FakeWorksheet``. ``fail(*statuses)`` queues error
+    responses that the next requests get instead, in order; ``failed`` counts
+    those served and ``requests`` logs every request as ``(monotonic time, path)``.
+    """
+
+    def __init__(self, worksheet, title="Form Responses 1"):
+        self.worksheet = worksheet
+        self.title = title
+        self.requests = []
+        self.failed = 0
+        self.delay = 0
+        self._failures = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def fail(self, *statuses, retry_after=None):
+        with self._lock:
+            self._failures.extend((status, retry_after) for status in statuses)
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name="fake-sheets", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _respond(self, path):
+        with self._lock:
+            self.requests.append((time.monotonic(), path))
+            failure = self._failures.pop(0) if self._failures else None
+            self.failed += failure is not None
+        if failure is not None:
+            status, retry_after = failure
+            error = {"error": {"code": status, "message": "fake failure", "status": ERROR_STATUSES.get(status, "UNKNOWN")}}
+            headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+            return status, error, headers
+
+        time.sleep(self.delay)
+        if "/values/" in path:
+            range_name = path.split("/values/", 1)[1].rpartition("!")[2]
+            return 200, {"range": range_name, "majorDimension": "ROWS", "values": self.worksheet.get_values(range_name)}, {}
+        grid = {"rowCount": len(self.worksheet.rows) + 1, "columnCount": len(self.worksheet.header)}
+        sheet = {"properties": {"title": self.title, "sheetId": 0, "index": 0, "gridProperties": grid}}
+        return 200, {"spreadsheetId": "sheet", "properties": {"title": "Tracker"}, "sheets": [sheet]}, {}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body, headers = server._respond(unquote(urlsplit(self.path).path))
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+@pytest.fixture
+def sheets_server(monkeypatch):
+    """A running ``FakeSheetsServer`` that gspread's request URLs point at."""
+    gspread_http = pytest.importorskip("gspread.http_client")
+    server = FakeSheetsServer(FakeWorksheet(generate_responses(20, players=3))).start()
+    for name in dir(gspread_http):
+        value = getattr(gspread_http, name)
+        if name.startswith("SPREADSHEET") and isinstance(value, str) and value.startswith(SHEETS_HOST):
+            monkeypatch.setattr(gspread_http, name, value.replace(SHEETS_HOST, server.url))
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def open_worksheet(sheets_server):
+    """Opens the fake server's worksheet through an anonymous gspread client."""
+    import gspread
+    from google.auth.credentials import AnonymousCredentials
+
+    client = gspread.authorize(AnonymousCredentials())
+    return lambda: client.open_by_key("sheet").worksheet(sheets_server.title)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_responses
+from tracker.activity import PAGE_SIZE, ActivityLog
+from tracker.schema import normalize
+from tracker.window import sort_by_time
+
+
+@pytest.fixture(scope="module")
+def responses():
+    df = normalize(generate_responses(3000, players=4))
+    # Distinct times, so newest first is a single order however ties are broken.
+    df = df.drop_duplicates("datetime").reset_index(drop=True)
+    df.loc[df.sample(60, random_state=0).index, "datetime"] = pd.NaT
+    return df
+
+
+def _expected(df, people=None, formats=None, search=""):
+    mask = pd.Series(True, index=df.index)
+    if people:
+        mask &= df["person"].isin(people)
+    if formats:
+        mask &= df["format"].isin(formats)
+    for word in search.lower().split():
+        mask &= df["notes"].str.lower().str.contains(rf"\b{word}", regex=True, na=False)
+    return df[mask].sort_values("datetime", ascending=False, na_position="last").index
+
+
+@pytest.mark.parametrize("order", ["presorted", "shuffled"])
+@pytest.mark.parametrize("filters", [
+    {},
+    {"people": ["Cain", "Player 3"]},
+    {"formats": ["Can"], "search": "lun"},
+    {"people": ["Shiv"], "search": "road tr"}
+])
+def test_pages_match_a_full_sort(responses, order, filters):
+    df = sort_by_time(responses) if order == "presorted" else responses.sample(frac=1, random_state=1)
+    log = ActivityLog(df)
+    assert log.presorted == (order == "presorted")
+
+    expected = _expected(df, **filters)
+    positions = log.filter(**filters)
+    pages = [log.page(positions, page).index for page in range(len(expected) // PAGE_SIZE + 2)]
+    assert all(len(page) == PAGE_SIZE for page in pages[:len(expected) // PAGE_SIZE])
+    assert np.array_equal(np.concatenate(pages), expected)
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from benchmarks.synthetic import FakeWorksheet, generate_responses
+from tracker.cli import main
+from tracker.sheets import MultiSourceSync, SheetSource, snapshot_name
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    source = SheetSource("sheet", "Form Responses 1", 2025, "Office")
+    MultiSourceSync([source], lambda source: FakeWorksheet(generate_responses(100, players=3)), snapshot_dir=str(tmp_path)).fetch()
+    return str(tmp_path / snapshot_name(source))
+
+
+def _leaderboard(capsys, *args):
+    assert main(["leaderboard", *args]) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+def test_season_and_league_filter_snapshots(snapshot, capsys):
+    assert _leaderboard(capsys, "--snapshot", snapshot)["rows"] == 100
+    assert _leaderboard(capsys, "--snapshot", snapshot, "--season", "2025", "--league", "Office")["rows"] == 100
+    assert _leaderboard(capsys, "--snapshot", snapshot, "--season", "2026")["rows"] == 0
+    assert _leaderboard(capsys, "--snapshot", snapshot, "--league", "Home")["rows"] == 0
+
+
+def test_season_filter_needs_a_recorded_season(tmp_path):
+    csv_path = tmp_path / "responses.csv"
+    generate_responses(10).to_csv(csv_path, index=False)
+    with pytest.raises(SystemExit) as exit_info:
+        main(["leaderboard", "--csv", str(csv_path), "--season", "2025"])
+    assert exit_info.value.code == 2
+
+
+def test_a_mistyped_future_date_does_not_pick_the_season(tmp_path, capsys):
+    responses = generate_responses(50, players=2)
+    responses.loc[0, "Date & time"] = "01/15/2206 12:00:00"
+    csv_path = tmp_path / "responses.csv"
+    responses.to_csv(csv_path, index=False)
+
+    assert main(["players", "--csv", str(csv_path), "--today", "2026-12-31"]) == 0
+    players = json.loads(capsys.readouterr().out)["players"]
+    assert sum(player["total_drinks"] for player in players) == 50
+    # Forecast for 2026, where the mistyped row doesn't count.
+    assert sum(player["predicted_drinks"] for player in players) == 49
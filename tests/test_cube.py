@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_responses
+from tracker.cube import DrinkCube
+from tracker.schema import normalize
+
+
+@pytest.fixture(scope="module")
+def season():
+    return normalize(generate_responses(2000, players=4))
+
+
+def _groupby(df, column):
+    return df.groupby([column, "person"], observed=True).size().rename("count").reset_index()
+
+
+def _table(cube, column):
+    return cube.table(column, "person")[[column, "person", "count"]]
+
+
+@pytest.mark.parametrize("column", ["date", "hour", "day_of_week", "format", "drink_type"])
+def test_tables_match_a_groupby(season, column):
+    pd.testing.assert_frame_equal(_table(DrinkCube(season, 2026), column), _groupby(season, column), check_dtype=False)
+
+
+def test_window_matches_the_rows_in_it(season):
+    window = DrinkCube(season, 2026).window(pd.Timestamp("2026-03-01"), pd.Timestamp("2026-05-31"))
+    rows = season[(season["date"] >= pd.Timestamp("2026-03-01")) & (season["date"] <= pd.Timestamp("2026-05-31"))]
+    for column in ["date", "hour", "format"]:
+        pd.testing.assert_frame_equal(_table(window, column), _groupby(rows, column), check_dtype=False)
+
+
+def test_dates_outside_the_season_only_count_towards_totals(season):
+    mistyped = season.copy()
+    mistyped.loc[0, "datetime"] = pd.Timestamp("2206-01-15 12:00")
+    mistyped.loc[1, "datetime"] = pd.Timestamp("1926-03-01 12:00")
+    cube = DrinkCube(mistyped, 2026)
+
+    assert cube.nbytes == DrinkCube(season, 2026).nbytes
+    assert cube.table("format", "person")["count"].sum() == len(season)
+    assert cube.table("date", "person")["count"].sum() == len(season) - 2
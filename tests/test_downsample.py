@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_responses
+from tracker.aggregates import cumulative_ounces
+from tracker.downsample import crossing_indices, downsample_series
+from tracker.schema import normalize
+
+GOAL = 5000
+MAX_POINTS = 200
+
+
+def _crossings(y, level):
+    return len(crossing_indices(y, level)) // 2
+
+
+def _assert_capped_with_crossings(raw, sampled, level):
+    for person, group in raw.groupby("person", observed=True):
+        kept = sampled[sampled["person"] == person]
+        crossings = _crossings(group["cumulative_ounces"].to_numpy(), level)
+        assert len(kept) <= MAX_POINTS + 2 * crossings, person
+        assert _crossings(kept["cumulative_ounces"].to_numpy(), level) == crossings, person
+
+
+def test_cumulative_series_keep_the_goal_crossing():
+    raw = cumulative_ounces(normalize(generate_responses(20_000, players=4)))
+    sampled = downsample_series(raw, "datetime", "cumulative_ounces", "person", MAX_POINTS, keep_level=GOAL)
+    assert (raw.groupby("person", observed=True)["cumulative_ounces"].max() > GOAL).all()
+    _assert_capped_with_crossings(raw, sampled, GOAL)
+
+
+def test_series_crossing_many_times():
+    rng = np.random.default_rng(0)
+    raw = pd.DataFrame({
+        "datetime": np.tile(pd.date_range("2026-01-01", periods=5000, freq="h"), 2),
+        "person": np.repeat(["Cain", "Shiv"], 5000),
+        "cumulative_ounces": GOAL + rng.normal(0, 50, 10_000).cumsum() / 10
+    })
+    sampled = downsample_series(raw, "datetime", "cumulative_ounces", "person", MAX_POINTS, keep_level=GOAL)
+    assert _crossings(raw["cumulative_ounces"].to_numpy()[:5000], GOAL) > 10
+    _assert_capped_with_crossings(raw, sampled, GOAL)
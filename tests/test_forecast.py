@@ -0,0 +1,62 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_responses
+from tracker.forecast import SeasonalForecast, forecast_year_end
+from tracker.schema import normalize
+from tracker.window import sort_by_time
+
+TODAY = date(2026, 6, 15)
+
+
+@pytest.fixture(scope="module")
+def season():
+    return normalize(generate_responses(2000, players=4, days=180))
+
+
+def _through(df, day):
+    return df[df["date"] <= pd.Timestamp(day)]
+
+
+def test_rows_outside_the_season_are_ignored(season):
+    past = _through(season, TODAY)
+    mistyped = past.copy()
+    mistyped.loc[0, "datetime"] = pd.Timestamp("1926-03-01 12:00")
+    mistyped.loc[1, "datetime"] = pd.Timestamp("2206-01-15 12:00")
+
+    expected = forecast_year_end(past.drop(index=[0, 1]), TODAY, 2026)
+    pd.testing.assert_frame_equal(forecast_year_end(sort_by_time(mistyped), TODAY, 2026), expected)
+
+
+def test_future_rows_are_not_counted_twice(season):
+    assert season["date"].max() > pd.Timestamp(TODAY)
+    pd.testing.assert_frame_equal(
+        forecast_year_end(season, TODAY, 2026),
+        forecast_year_end(_through(season, TODAY), TODAY, 2026)
+    )
+
+
+def test_incremental_updates_match_a_fresh_fit(season):
+    forecast = SeasonalForecast(2026)
+    for day in [date(2026, 3, 1), date(2026, 4, 1), TODAY]:
+        forecast.update(_through(season, day), day)
+    pd.testing.assert_frame_equal(forecast.predict(), forecast_year_end(_through(season, TODAY), TODAY, 2026))
+
+
+def test_finished_season_predicts_its_totals():
+    df = normalize(generate_responses(500, players=2, start="2025-01-01"))
+    forecast = forecast_year_end(df, date(2026, 6, 1), 2025)
+    totals = df.groupby("person", observed=True).size()
+    assert (forecast["predicted_drinks"] == totals.reindex(forecast.index)).all()
+    assert (forecast["predicted_drinks_low"] == forecast["predicted_drinks_high"]).all()
+
+
+def test_edits_to_folded_rows_trigger_a_refit(season):
+    past = _through(season, TODAY)
+    forecast = SeasonalForecast(2026).update(past, TODAY)
+    edited = past.copy()
+    edited.loc[:199, "ounces"] = 64
+
+    pd.testing.assert_frame_equal(forecast.update(edited, TODAY).predict(), forecast_year_end(edited, TODAY, 2026))
@@ -0,0 +1,22 @@
+import numpy as np
+
+from benchmarks.synthetic import generate_responses
+from tracker.refresher import BackgroundRefresher
+from tracker.schema import normalize
+
+
+def test_session_views_share_the_frame_until_written():
+    shared = normalize(generate_responses(100, players=3))
+    expected = shared.copy()
+    refresher = BackgroundRefresher(lambda: shared)
+
+    view = refresher.current().df
+    assert np.shares_memory(view["ounces"].to_numpy(), shared["ounces"].to_numpy())
+
+    view["ounces"] = 0
+    view.loc[0, "hour"] = 3
+    view["person"] = view["person"].cat.rename_categories(str.upper)
+    view.drop(columns="format", inplace=True)
+
+    assert shared.equals(expected)
+    assert refresher.current().df.equals(expected)
@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_responses
+from tracker.schema import DTYPES, concat_frames, map_headers, normalize
+
+
+def _untyped_normalize(df):
+    # The normalization before the typed schema: object columns and int64/float64 numbers.
+    df = df.rename(columns=map_headers(df.columns))
+    df["datetime"] = pd.to_datetime(df["datetime"], errors="coerce")
+    df["date"] = df["datetime"].dt.date
+    df["hour"] = df["datetime"].dt.hour
+    df["day_of_week"] = df["datetime"].dt.day_name()
+    df["week"] = df["datetime"].dt.isocalendar().week.astype("int64")
+    df["month"] = df["datetime"].dt.month
+    df["ounces"] = df["ounces"].astype(str).str.replace(r"[^\d.]", "", regex=True)
+    df["ounces"] = pd.to_numeric(df["ounces"], errors="coerce").fillna(12)
+    df["is_diet_coke"] = df["drink_type"].str.lower().str.contains("diet coke", na=False)
+    return df.astype({col: object for col in ["person", "drink_type", "format", "first_beverage", "day_of_week"]})
+
+
+def test_typed_schema_shrinks_a_large_sheet():
+    raw = generate_responses(200_000, players=20)
+    before = _untyped_normalize(raw.copy()).memory_usage(deep=True).sum()
+    df = normalize(raw.copy())
+    after = df.memory_usage(deep=True).sum()
+
+    assert after < before / 2
+    for col in ["person", "drink_type", "format", "first_beverage", "day_of_week"]:
+        assert isinstance(df[col].dtype, pd.CategoricalDtype), col
+    assert df["day_of_week"].dtype == DTYPES["day_of_week"]
+    assert df["hour"].dtype == "Int8"
+    assert df["month"].dtype == "Int8"
+    assert df["week"].dtype == "UInt8"
+    assert df["ounces"].dtype == "float32"
+
+
+def test_typed_schema_keeps_the_values():
+    raw = generate_responses(5_000, players=5)
+    untyped = _untyped_normalize(raw.copy())
+    df = normalize(raw.copy())
+
+    for col in ["person", "drink_type", "format", "day_of_week"]:
+        assert (df[col].astype(object) == untyped[col]).all(), col
+    assert (df["hour"].astype("int64") == untyped["hour"]).all()
+    assert (df["ounces"].astype("float64") - untyped["ounces"]).abs().max() < 1e-3
+    assert (df["is_diet_coke"] == untyped["is_diet_coke"]).all()
+
+
+def test_ounces_parse_units_and_default():
+    raw = generate_responses(4, players=1)
+    raw["Ounces"] = ["20", "32 oz", "", "16.9"]
+    assert normalize(raw)["ounces"].tolist() == [20, 32, 12, pytest.approx(16.9)]
+
+
+def test_concat_frames_unions_categories():
+    first = normalize(generate_responses(10, players=2))
+    second = normalize(generate_responses(10, players=5, seed=1))
+    df = concat_frames([first, second])
+
+    assert isinstance(df["person"].dtype, pd.CategoricalDtype)
+    assert set(df["person"].cat.categories) == set(first["person"]) | set(second["person"])
+    assert df["hour"].dtype == "Int8"
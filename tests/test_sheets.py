@@ -0,0 +1,205 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import FakeWorksheet, generate_responses
+from tracker.schema import normalize
+from tracker.sheets import IncrementalSync, MultiSourceSync, RequestQuota, SheetSource, with_backoff
+
+
+def _sync(worksheet, **kwargs):
+    return IncrementalSync(lambda: worksheet, **kwargs)
+
+
+def _expected(worksheet):
+    return normalize(pd.DataFrame(worksheet.rows, columns=worksheet.header))
+
+
+def _assert_matches_sheet(df, worksheet):
+    pd.testing.assert_frame_equal(df.reset_index(drop=True), _expected(worksheet))
+
+
+def test_fetches_only_appended_rows():
+    worksheet = FakeWorksheet(generate_responses(50, players=3))
+    sync = _sync(worksheet)
+    sync.fetch()
+    worksheet.append(generate_responses(5, players=3, seed=1))
+
+    requests = worksheet.requests
+    df = sync.fetch()
+    assert worksheet.requests == requests + 1
+    assert sync.last_row == 56
+    _assert_matches_sheet(df, worksheet)
+
+
+def test_deleted_rows_trigger_a_full_resync():
+    worksheet = FakeWorksheet(generate_responses(50, players=3))
+    sync = _sync(worksheet)
+    sync.fetch()
+    del worksheet.rows[10:12]
+    worksheet.append(generate_responses(3, players=3, seed=1))
+
+    df = sync.fetch()
+    assert len(df) == 51
+    assert sync.last_row == 52
+    _assert_matches_sheet(df, worksheet)
+
+
+def test_edited_last_row_triggers_a_full_resync():
+    worksheet = FakeWorksheet(generate_responses(20, players=3))
+    sync = _sync(worksheet)
+    sync.fetch()
+    worksheet.rows[-1][5] = "32 oz"
+
+    df = sync.fetch()
+    _assert_matches_sheet(df, worksheet)
+    assert sync.aggregates.tables()["leaderboard"]["total_ounces"].sum() == pytest.approx(df["ounces"].sum())
+
+
+def test_reset_picks_up_edits_to_earlier_rows():
+    worksheet = FakeWorksheet(generate_responses(20, players=3))
+    sync = _sync(worksheet)
+    sync.fetch()
+    worksheet.rows[3][5] = "32 oz"
+
+    assert sync.fetch()["ounces"].iloc[3] != 32
+    sync.reset()
+    _assert_matches_sheet(sync.fetch(), worksheet)
+
+
+def test_full_sync_seconds_rereads_the_sheet():
+    worksheet = FakeWorksheet(generate_responses(20, players=3))
+    sync = _sync(worksheet, full_sync_seconds=0)
+    sync.fetch()
+    worksheet.rows[3][5] = "32 oz"
+
+    _assert_matches_sheet(sync.fetch(), worksheet)
+
+
+def test_reset_rechecks_the_header():
+    responses = generate_responses(20, players=3)
+    worksheet = FakeWorksheet(responses)
+    sync = _sync(worksheet)
+    sync.fetch()
+    worksheet.header = worksheet.header[:-1]
+    worksheet.rows = [row[:-1] for row in worksheet.rows]
+    sync.reset()
+
+    _assert_matches_sheet(sync.fetch(), worksheet)
+
+
+def test_resumes_from_snapshot(tmp_path):
+    worksheet = FakeWorksheet(generate_responses(30, players=3))
+    path = str(tmp_path / "source.arrow")
+    _sync(worksheet, snapshot_path=path).fetch()
+    worksheet.append(generate_responses(4, players=3, seed=1))
+
+    sync = _sync(worksheet, snapshot_path=path)
+    assert sync.last_row == 31
+    requests = worksheet.requests
+    df = sync.fetch()
+    # Header check plus one read from the last known row.
+    assert worksheet.requests == requests + 2
+    _assert_matches_sheet(df, worksheet)
+
+
+def test_sync_recovers_from_rate_limits_and_outages(sheets_server, open_worksheet):
+    sheets_server.fail(429, 503, 429, retry_after=0)
+    sync = IncrementalSync(open_worksheet)
+
+    _assert_matches_sheet(sync.fetch(), sheets_server.worksheet)
+    sheets_server.worksheet.append(generate_responses(3, players=3, seed=1))
+    sheets_server.fail(503, retry_after=0)
+    _assert_matches_sheet(sync.fetch(), sheets_server.worksheet)
+    assert sheets_server.failed == 4
+
+
+def test_backoff_waits_as_long_as_retry_after_says(sheets_server, open_worksheet):
+    worksheet = open_worksheet()
+    sheets_server.fail(429, retry_after=7)
+    sheets_server.fail(503)
+    sleeps = []
+
+    values = with_backoff(lambda: worksheet.get_values("A2:H"), sleep=sleeps.append)
+    assert values == sheets_server.worksheet.rows
+    assert sleeps[0] == 7
+    # Without Retry-After the second attempt backs off 2 s, jittered down to no less than half.
+    assert 1 <= sleeps[1] <= 2
+
+
+def test_backoff_does_not_retry_permanent_errors(sheets_server, open_worksheet):
+    from gspread.exceptions import APIError
+
+    worksheet = open_worksheet()
+    sheets_server.fail(403)
+    requests, sleeps = len(sheets_server.requests), []
+
+    with pytest.raises(APIError):
+        with_backoff(lambda: worksheet.get_values("A2:H"), sleep=sleeps.append)
+    assert sleeps == []
+    assert len(sheets_server.requests) == requests + 1
+
+
+def test_sync_gives_up_and_reopens_on_the_next_fetch(sheets_server, open_worksheet):
+    from gspread.exceptions import APIError
+
+    sync = IncrementalSync(open_worksheet, attempts=2)
+    sync.fetch()
+    sheets_server.fail(503, 503, retry_after=0)
+
+    with pytest.raises(APIError):
+        sync.fetch()
+    assert sheets_server.failed == 2
+    assert sync.worksheet is None
+    _assert_matches_sheet(sync.fetch(), sheets_server.worksheet)
+
+
+def test_concurrent_fetches_share_one_request(sheets_server, open_worksheet):
+    sync = IncrementalSync(open_worksheet)
+    sync.fetch()
+    sheets_server.delay = 0.5
+    requests = len(sheets_server.requests)
+    start = threading.Barrier(8)
+    frames = []
+
+    def fetch():
+        start.wait()
+        frames.append(sync.fetch())
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(sheets_server.requests) == requests + 1
+    assert all(frame is frames[0] for frame in frames)
+
+
+def test_quota_lets_a_minute_of_requests_through_then_paces_them(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("tracker.sheets.time.sleep", sleeps.append)
+    quota = RequestQuota(60)
+    for _ in range(60):
+        quota.acquire()
+    assert sleeps == []
+
+    quota.acquire()
+    quota.acquire()
+    assert sleeps == [pytest.approx(1, abs=0.05), pytest.approx(2, abs=0.05)]
+
+
+def _timed_fetch(sources, open_worksheet):
+    sync = MultiSourceSync(sources, lambda source: open_worksheet(), max_workers=len(sources), requests_per_minute=60)
+    start = time.perf_counter()
+    sync.fetch()
+    return time.perf_counter() - start
+
+
+def test_sources_fetch_in_parallel_under_the_quota(sheets_server, open_worksheet):
+    sheets_server.delay = 0.2
+    sources = [SheetSource("sheet", sheets_server.title, 2026, f"League {number}") for number in range(4)]
+    one = _timed_fetch(sources[:1], open_worksheet)
+    four = _timed_fetch(sources, open_worksheet)
+    assert four < 2 * one
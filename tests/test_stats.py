@@ -0,0 +1,30 @@
+from datetime import date
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_responses
+from tracker.cube import DrinkCube
+from tracker.schema import normalize
+from tracker.stats import player_summary
+
+
+def test_window_outside_the_season_cube():
+    df = normalize(generate_responses(300, players=3, start="2026-12-01", days=60))
+    start, end = pd.Timestamp("2027-01-03"), pd.Timestamp("2027-01-09")
+    window = df[(df["date"] >= start) & (df["date"] <= end)]
+    cube = DrinkCube(df, 2026).window(start, end)
+    assert len(window) and cube.counts.shape[1] == 0
+
+    summary = player_summary(window, today=date(2027, 1, 9), year=2026, cube=cube)
+    assert (summary["max_drinks_one_day"] == 0).all()
+    assert summary["max_drinks_date"].isna().all()
+
+
+def test_streaks_carry_across_new_year():
+    days = pd.date_range("2025-11-01 09:00", "2026-01-10 09:00", freq="D")
+    responses = generate_responses(len(days), players=1)
+    responses["Date & time"] = days.strftime("%m/%d/%Y %H:%M:%S")
+    df = normalize(responses)
+
+    summary = player_summary(df, today=date(2026, 1, 10), year=2026, cube=DrinkCube(df, 2026))
+    assert summary.loc["Cain", ["current_streak", "longest_streak"]].tolist() == [71, 71]
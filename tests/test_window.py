@@ -0,0 +1,10 @@
+from datetime import date
+
+from tracker.window import preset_bounds, season_day
+
+
+def test_presets_end_on_the_last_day_of_a_past_season():
+    today = date(2027, 1, 12)
+    assert preset_bounds("Last 7 days", season_day(2026, today)) == (date(2026, 12, 25), date(2026, 12, 31))
+    assert preset_bounds("This month", season_day(2026, today)) == (date(2026, 12, 1), date(2026, 12, 31))
+    assert preset_bounds("Last 7 days", season_day(2027, today)) == (date(2027, 1, 6), today)
@@ -0,0 +1,98 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZE = 15
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+class NotesIndex:
+    """Inverted index from lower-cased note words to the rows that use them.
+
+    Notes repeat a lot, so words are indexed per distinct note and a search
+    maps the matching notes back to rows with one vectorized lookup. Each
+    query word matches as a prefix, so results narrow while typing.
+    """
+
+    def __init__(self, notes):
+        self.codes, distinct = pd.factorize(notes.fillna("").astype(str))
+        postings = {}
+        for note_id, note in enumerate(distinct):
+            for token in set(tokenize(note)):
+                postings.setdefault(token, []).append(note_id)
+        self.vocabulary = np.array(sorted(postings), dtype=object)
+        self.postings = [np.array(postings[token]) for token in self.vocabulary]
+        self.note_count = len(distinct)
+
+    def note_ids(self, prefix):
+        start = np.searchsorted(self.vocabulary, prefix, side="left")
+        end = np.searchsorted(self.vocabulary, prefix + "\uffff", side="left")
+        if start == end:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(self.postings[start:end]))
+
+    def matches(self, query):
+        """Boolean row mask for notes containing every word of ``query``."""
+        tokens = tokenize(query)
+        if not tokens:
+            return np.ones(len(self.codes), dtype=bool)
+        hits = np.ones(self.note_count, dtype=bool)
+        for token in tokens:
+            found = np.zeros(self.note_count, dtype=bool)
+            found[self.note_ids(token)] = True
+            hits &= found
+        return hits[self.codes]
+
+
+class ActivityLog:
+    """The whole log, newest first, filtered and paged without sorting the frame per request.
+
+    Frames already sorted by ``datetime`` (as the synced ones are) are paged
+    by slicing positions from the end; anything else picks each page with a
+    partial top-k selection.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        times = df["datetime"]
+        self.logged = times.notna().to_numpy()
+        dated = int(self.logged.sum())
+        self.presorted = bool(self.logged[:dated].all() and times.iloc[:dated].is_monotonic_increasing)
+        self.times = times.to_numpy().astype("datetime64[us]").astype(np.int64)
+        self.notes = NotesIndex(df["notes"]) if "notes" in df.columns else None
+
+    def filter(self, people=None, formats=None, drink_types=None, search=""):
+        """Row positions matching every filter that's set; empty filters match everything."""
+        mask = np.ones(len(self.df), dtype=bool)
+        for column, values in (("person", people), ("format", formats), ("drink_type", drink_types)):
+            if values:
+                mask &= self.df[column].isin(values).to_numpy()
+        if search and self.notes is not None:
+            mask &= self.notes.matches(search)
+        return np.flatnonzero(mask)
+
+    def page(self, positions, page, page_size=PAGE_SIZE):
+        """Rows of ``page`` (0-based) from ``positions`` ordered newest first, undated rows last."""
+        start, end = page * page_size, (page + 1) * page_size
+        dated = positions[self.logged[positions]]
+        undated = positions[~self.logged[positions]]
+
+        if self.presorted:
+            newest = dated[::-1][start:end]
+        elif end < len(dated):
+            keys = -self.times[dated]
+            top = np.argpartition(keys, end - 1)[:end]
+            top = top[np.argsort(keys[top], kind="stable")]
+            newest = dated[top[start:end]]
+        else:
+            newest = dated[np.argsort(-self.times[dated], kind="stable")][start:end]
+
+        if len(newest) < page_size:
+            skip = max(0, start - len(dated))
+            newest = np.concatenate([newest, undated[skip:skip + page_size - len(newest)]])
+        return self.df.iloc[newest]
@@ -0,0 +1,46 @@
+from tracker.cube import DrinkCube
+from tracker.downsample import downsample_series
+
+CHART_MAX_POINTS = 500
+
+
+def leaderboard(df):
+    grouped = df.groupby("person", observed=True)
+    board = grouped.agg(
+        total_drinks=("person", "size"),
+        total_ounces=("ounces", "sum"),
+        days_active=("date", "nunique")
+    )
+    board["avg_daily_drinks"] = (board["total_drinks"] / board["days_active"].where(board["days_active"] > 0)).fillna(0)
+    return board.drop(columns="days_active").sort_values("total_drinks", ascending=False)
+
+
+def cumulative_ounces(df):
+    cumulative = df[["datetime", "person", "ounces"]].sort_values("datetime", kind="stable")
+    cumulative["cumulative_ounces"] = cumulative.groupby("person", observed=True)["ounces"].cumsum()
+    return cumulative
+
+
+def dashboard_aggregates(df, goal_ounces=None, cube=None, year=None):
+    """Every table the dashboard charts read, computed together so they can be cached per data version.
+
+    Everything but the cumulative series is a slice of ``cube`` (a
+    ``DrinkCube`` of ``df``, built here for season ``year`` if not given). The cumulative series
+    is downsampled to ``CHART_MAX_POINTS`` per player, keeping the points
+    around any crossing of ``goal_ounces``.
+    """
+    if cube is None:
+        cube = DrinkCube(df, year)
+    return {
+        "people": df["person"].unique().tolist(),
+        "leaderboard": cube.leaderboard(),
+        "daily_trends": cube.table("date", "person").rename(columns={"count": "drinks"}),
+        "cumulative": downsample_series(
+            cumulative_ounces(df), "datetime", "cumulative_ounces", "person",
+            CHART_MAX_POINTS, keep_level=goal_ounces
+        ),
+        "hourly": cube.table("hour", "person").drop(columns="ounces"),
+        "daily": cube.table("day_of_week", "person").drop(columns="ounces"),
+        "format_counts": cube.table("format", "person").drop(columns="ounces"),
+        "drink_type_counts": cube.table("drink_type", "person").drop(columns="ounces")
+    }
@@ -0,0 +1,169 @@
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+DC_RED = "#E61A27"
+DC_SILVER = "#C0C0C0"
+DC_DARK_SILVER = "#8A8A8A"
+DC_BLACK = "#1A1A1A"
+DC_WHITE = "#FFFFFF"
+DC_LIGHT_GRAY = "#F5F5F5"
+
+PERSON_COLORS = {
+    "Cain": DC_RED,
+    "Shiv": DC_DARK_SILVER
+}
+LEAGUE_PALETTE = px.colors.qualitative.Dark24
+
+CHART_RENDER_MODE = "webgl"
+CHART_TEMPLATE = "diet_coke"
+
+
+def player_colors(people):
+    """Fixed colours for the original players, then palette colours in roster order so nobody's colour shifts as others join."""
+    palette = [color for color in LEAGUE_PALETTE if color not in PERSON_COLORS.values()]
+    others = [person for person in people if person not in PERSON_COLORS]
+    colors = {person: palette[index % len(palette)] for index, person in enumerate(others)}
+    colors.update({person: color for person, color in PERSON_COLORS.items() if person in people})
+    return colors
+
+
+def register_chart_template():
+    """Bake the dashboard's chart styling into a Plotly template once, so figures pick it up at creation.
+
+    The dashboard draws charts with ``theme=None``: Streamlit's own theme would
+    otherwise be merged over the template in the browser.
+    """
+    template = go.layout.Template(pio.templates["plotly"])
+    template.layout.update(
+        font_family="Open Sans",
+        title_font_family="Bebas Neue",
+        title_font_size=24,
+        title_font_color=DC_BLACK,
+        paper_bgcolor="white",
+        plot_bgcolor="rgba(0,0,0,0)",
+        margin=dict(l=40, r=40, t=80, b=40),
+        legend=dict(
+            bgcolor="rgba(255,255,255,0.9)",
+            bordercolor=DC_SILVER,
+            borderwidth=1,
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="center",
+            x=0.5
+        ),
+        xaxis=dict(
+            gridcolor=DC_LIGHT_GRAY,
+            linecolor=DC_SILVER
+        ),
+        yaxis=dict(
+            gridcolor=DC_LIGHT_GRAY,
+            linecolor=DC_SILVER
+        )
+    )
+    pio.templates[CHART_TEMPLATE] = template
+
+
+def dashboard_figures(aggregates, colors, goal_ounces):
+    """Every dashboard figure from the ``dashboard_aggregates`` tables plus the ``hour_weekday`` cross-tab.
+
+    ``colors`` maps each player to a colour (see ``player_colors``).
+    """
+    if CHART_TEMPLATE not in pio.templates:
+        register_chart_template()
+    fig_drinks = px.line(
+        aggregates["daily_trends"],
+        x="date",
+        y="drinks",
+        color="person",
+        title="DAILY DRINK COUNT",
+        markers=True,
+        color_discrete_map=colors,
+        template=CHART_TEMPLATE
+    )
+    fig_drinks.update_traces(line=dict(width=3), marker=dict(size=10))
+    fig_drinks.update_layout(xaxis_title="", yaxis_title="Drinks")
+
+    fig_cumulative = px.line(
+        aggregates["cumulative"],
+        x="datetime",
+        y="cumulative_ounces",
+        color="person",
+        title=f"THE RACE TO {goal_ounces} OUNCES",
+        color_discrete_map=colors,
+        render_mode=CHART_RENDER_MODE,
+        template=CHART_TEMPLATE
+    )
+    fig_cumulative.update_traces(line=dict(width=4))
+    fig_cumulative.add_hline(y=goal_ounces, line_dash="dash", line_color=DC_SILVER, annotation_text=f"{goal_ounces} oz Goal")
+    fig_cumulative.update_layout(xaxis_title="", yaxis_title="Total Ounces")
+
+    fig_hourly = px.bar(
+        aggregates["hourly"],
+        x="hour",
+        y="count",
+        color="person",
+        barmode="group",
+        title="DRINKS BY HOUR",
+        color_discrete_map=colors,
+        template=CHART_TEMPLATE
+    )
+    fig_hourly.update_layout(xaxis_title="Hour of Day", yaxis_title="Count")
+
+    fig_daily = px.bar(
+        aggregates["daily"],
+        x="day_of_week",
+        y="count",
+        color="person",
+        barmode="group",
+        title="DRINKS BY DAY OF WEEK",
+        color_discrete_map=colors,
+        template=CHART_TEMPLATE
+    )
+    fig_daily.update_layout(xaxis_title="", yaxis_title="Count")
+
+    fig_format = px.bar(
+        aggregates["format_counts"],
+        x="count",
+        y="format",
+        color="person",
+        barmode="group",
+        title="DRINKS BY FORMAT",
+        orientation="h",
+        color_discrete_map=colors,
+        template=CHART_TEMPLATE
+    )
+    fig_format.update_layout(xaxis_title="Count", yaxis_title="")
+
+    fig_type = px.bar(
+        aggregates["drink_type_counts"],
+        x="count",
+        y="drink_type",
+        color="person",
+        barmode="group",
+        title="DC VS INFERIOR PRODUCTS",
+        orientation="h",
+        color_discrete_map=colors,
+        template=CHART_TEMPLATE
+    )
+    fig_type.update_layout(xaxis_title="Count", yaxis_title="")
+
+    fig_hour_weekday = px.imshow(
+        aggregates["hour_weekday"],
+        title="DRINKS BY HOUR AND DAY",
+        color_continuous_scale=[DC_LIGHT_GRAY, DC_RED],
+        aspect="auto",
+        template=CHART_TEMPLATE
+    )
+    fig_hour_weekday.update_layout(xaxis_title="Hour of Day", yaxis_title="", coloraxis_colorbar_title="Drinks")
+
+    return {
+        "drinks": fig_drinks,
+        "cumulative": fig_cumulative,
+        "hourly": fig_hourly,
+        "daily": fig_daily,
+        "format": fig_format,
+        "type": fig_type,
+        "hour_weekday": fig_hour_weekday
+    }
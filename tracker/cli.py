@@ -0,0 +1,82 @@
+"""Print dashboard stats as JSON from a local CSV export or Arrow snapshot, without the Streamlit UI.
+
+    python -m tracker leaderboard --csv responses.csv
+    python -m tracker players --snapshot .cache/<source>.arrow --today 2026-06-30
+    python -m tracker export --snapshot .cache/<source>.arrow --out public
+"""
+import argparse
+import json
+import sys
+from datetime import date
+
+import pandas as pd
+
+from tracker.aggregates import leaderboard
+from tracker.schema import DTYPES, normalize
+from tracker.snapshot import load_snapshot
+from tracker.stats import data_version, player_summary, records
+
+
+def load_frame(csv_path=None, snapshot_path=None):
+    """The normalized frame, with ``season`` and ``league`` columns when the snapshot records its source's."""
+    if csv_path:
+        return normalize(pd.read_csv(csv_path, dtype=str, keep_default_na=False))
+    snapshot = load_snapshot(snapshot_path)
+    if snapshot is None:
+        raise SystemExit(f"No usable snapshot at {snapshot_path}")
+    df, metadata = snapshot
+    if metadata.get("season") is not None:
+        df = df.assign(season=metadata["season"], league=metadata["league"]).astype({"season": DTYPES["season"], "league": DTYPES["league"]})
+    return df
+
+
+def build_report(df, command, today, year):
+    report = {"version": data_version(df), "rows": len(df)}
+    if command in ("leaderboard", "summary"):
+        report["leaderboard"] = records(leaderboard(df))
+    if command in ("players", "summary"):
+        report["players"] = records(player_summary(df, today=today, year=year))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tracker", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", default="summary", choices=["summary", "leaderboard", "players", "export"])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", help="CSV export of the form responses sheet")
+    source.add_argument("--snapshot", help="Arrow snapshot written by the dashboard")
+    parser.add_argument("--season", type=int, help="only include this season (snapshots record their source's season)")
+    parser.add_argument("--league", help="only include this league (snapshots record their source's league)")
+    parser.add_argument("--year", type=int, help="year to predict to (defaults to the season or the year of the latest row up to today)")
+    parser.add_argument("--today", type=date.fromisoformat, help="date streaks are counted back from (defaults to today)")
+    parser.add_argument("--indent", type=int, default=2)
+    parser.add_argument("--out", help="directory the export command writes the static bundle to")
+    args = parser.parse_args(argv)
+    if args.command == "export" and not args.out:
+        parser.error("export needs --out")
+
+    df = load_frame(args.csv, args.snapshot)
+    if (args.season is not None or args.league is not None) and "season" not in df.columns:
+        parser.error("--season and --league need a snapshot that records its season and league; CSV exports and older snapshots don't")
+    if args.season is not None:
+        df = df[df["season"] == args.season]
+    if args.league is not None:
+        df = df[df["league"] == args.league]
+
+    year = args.year or args.season
+    if year is None:
+        # Ignore dates after today, so a mistyped future year can't pick the season.
+        latest = df["datetime"][df["datetime"] < pd.Timestamp(args.today or date.today()) + pd.Timedelta(days=1)].max()
+        year = latest.year if pd.notna(latest) else date.today().year
+
+    if args.command == "export":
+        from tracker.export import export_bundle
+
+        written = export_bundle(df, args.out, today=args.today)
+        print(f"Exported {data_version(df)} to {args.out}" if written else f"{args.out} is already at {data_version(df)}")
+        return 0
+
+    report = build_report(df, args.command, args.today, year)
+    json.dump(report, sys.stdout, indent=args.indent or None)
+    sys.stdout.write("\n")
+    return 0
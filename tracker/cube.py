@@ -0,0 +1,237 @@
+import numpy as np
+import pandas as pd
+
+from tracker.schema import DAY_ORDER, DTYPES, weekday
+
+HOURS = 24
+AXES = ["person", "date", "hour", "format", "drink_type"]
+# Coarser time dimensions, folded from the date axis.
+DATE_GROUPS = {
+    "day_of_week": weekday,
+    "month": lambda days: days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) % 12
+}
+
+
+def _encode(values):
+    """Codes into the observed categories (in category order), with missing values in a trailing slot."""
+    values = values.astype("category")
+    codes = values.cat.codes.to_numpy()
+    observed = np.unique(codes[codes >= 0])
+    codes = np.where(codes < 0, len(observed), np.searchsorted(observed, codes))
+    return codes.astype(np.int64), pd.Categorical.from_codes(observed, dtype=values.dtype)
+
+
+def _count(cells, ounces, shape):
+    size = int(np.prod(shape))
+    return np.bincount(cells, minlength=size).reshape(shape), np.bincount(cells, weights=ounces, minlength=size).reshape(shape)
+
+
+class DrinkCube:
+    """Drinks and ounces for every person × date × hour × format × drink type, counted in one pass.
+
+    Rows are encoded to flat cell numbers and reduced with two ``bincount``
+    calls into dense arrays, so every dashboard table and player stat is a
+    sum or slice of them, and a date window is a slice of the date axis.
+    Memory is 8 bytes per cell: players × days × 24 × formats × drink types.
+
+    The date axis runs from the first day logged to the last, or over the
+    calendar year ``year`` when given, so one mistyped date can't stretch it
+    across centuries. Rows without a time, and rows dated outside ``year``,
+    have no place on it, so they sit in a separate person × format × drink
+    type block that only counts towards totals. Rows without a player are
+    left out entirely.
+    """
+
+    def __init__(self, df, year=None):
+        named = df["person"].notna().to_numpy()
+        if not named.all():
+            df = df[named]
+
+        person_codes, self.people = _encode(df["person"])
+        format_codes, self.formats = _encode(df["format"])
+        type_codes, self.drink_types = _encode(df["drink_type"])
+        players, formats, types = len(self.people), len(self.formats) + 1, len(self.drink_types) + 1
+
+        times = df["datetime"].to_numpy()
+        dated = ~np.isnat(times)
+        days = times.astype("datetime64[D]").astype(np.int64)
+        if year is not None:
+            self.first_day = int(np.datetime64(f"{year}-01-01", "D").astype(np.int64))
+            span = int(np.datetime64(f"{year + 1}-01-01", "D").astype(np.int64)) - self.first_day
+            dated &= (days >= self.first_day) & (days < self.first_day + span)
+        days = days[dated]
+        if year is None:
+            self.first_day = int(days.min()) if len(days) else 0
+            span = int(days.max()) - self.first_day + 1 if len(days) else 0
+        hours = df["hour"].to_numpy(dtype=np.int64, na_value=0)[dated]
+        self.date_dtype = df["date"].dtype if "date" in df.columns else np.dtype("datetime64[ns]")
+
+        ounces = df["ounces"].to_numpy(dtype=np.float64)
+        time_cell = (person_codes[dated] * span + (days - self.first_day)) * HOURS + hours
+        kind_cell = (person_codes[dated] * formats + format_codes[dated]) * types + type_codes[dated]
+        cell = (time_cell * formats + format_codes[dated]) * types + type_codes[dated]
+        shape = (players, span, HOURS, formats, types)
+        self.counts = np.bincount(cell, minlength=int(np.prod(shape))).astype(np.int32).reshape(shape)
+        self.ounces = np.bincount(cell, weights=ounces[dated], minlength=int(np.prod(shape))).astype(np.float32).reshape(shape)
+        # The two blocks every dashboard table sums from, counted straight off the rows.
+        self._marginals = {
+            (0, 1, 2): _count(time_cell, ounces[dated], (players, span, HOURS)),
+            (0, 3, 4): _count(kind_cell, ounces[dated], (players, formats, types))
+        }
+
+        cell = (person_codes[~dated] * formats + format_codes[~dated]) * types + type_codes[~dated]
+        shape = (players, formats, types)
+        self.undated_counts = np.bincount(cell, minlength=int(np.prod(shape))).astype(np.int32).reshape(shape)
+        self.undated_ounces = np.bincount(cell, weights=ounces[~dated], minlength=int(np.prod(shape))).reshape(shape)
+        self._sums = {}
+
+    @property
+    def nbytes(self):
+        return self.counts.nbytes + self.ounces.nbytes
+
+    def window(self, start=None, end=None):
+        """The cube for whole days from ``start`` through ``end`` (``None`` is unbounded), sharing this one's arrays."""
+        if start is None and end is None:
+            return self
+        first = 0 if start is None else int(np.datetime64(start, "D").astype(np.int64)) - self.first_day
+        last = self.counts.shape[1] if end is None else int(np.datetime64(end, "D").astype(np.int64)) - self.first_day + 1
+        first, last = min(max(first, 0), self.counts.shape[1]), min(max(last, first), self.counts.shape[1])
+        view = object.__new__(DrinkCube)
+        view.__dict__.update(self.__dict__)
+        view.first_day = self.first_day + first
+        view.counts = self.counts[:, first:last]
+        view.ounces = self.ounces[:, first:last]
+        # Windowed frames drop untimed rows too.
+        view.undated_counts = np.zeros_like(self.undated_counts)
+        view.undated_ounces = np.zeros_like(self.undated_ounces)
+        view._sums = {}
+        view._marginals = {(0, 1, 2): tuple(array[:, first:last] for array in self._marginals[(0, 1, 2)])}
+        return view
+
+    def labels(self, dim):
+        if dim == "person":
+            return self.people
+        if dim == "format":
+            return self.formats
+        if dim == "drink_type":
+            return self.drink_types
+        if dim == "date":
+            days = np.arange(self.first_day, self.first_day + self.counts.shape[1]).astype("datetime64[D]")
+            return pd.Series(days).astype(self.date_dtype).array
+        if dim == "hour":
+            return pd.array(np.arange(HOURS), dtype=DTYPES["hour"])
+        if dim == "day_of_week":
+            return pd.Categorical(DAY_ORDER, dtype=DTYPES["day_of_week"])
+        if dim == "month":
+            return pd.array(np.arange(1, 13), dtype=DTYPES["month"])
+        raise ValueError(f"unknown cube dimension {dim!r}")
+
+    def sums(self, *dims):
+        """Drink counts and ounces summed over everything but ``dims``, as arrays with one axis per dim in order.
+
+        ``format`` and ``drink_type`` axes end with a slot for missing values.
+        Keeping any time dimension leaves out rows without a time. Results are
+        kept for reuse, so they're read-only.
+        """
+        if dims not in self._sums:
+            self._sums[dims] = self._reduce(dims)
+        return self._sums[dims]
+
+    def _reduce(self, dims):
+        axes = [AXES.index(dim) if dim in AXES else AXES.index("date") for dim in dims]
+        if len(set(axes)) != len(axes):
+            raise ValueError(f"dimensions {dims} share a cube axis")
+        timed = any(axis in (1, 2) for axis in axes)
+
+        counts, ounces = self._marginal(tuple(sorted(axes)))
+        dropped = tuple(axis for axis in range(len(AXES)) if axis not in axes)
+        if not timed:
+            dropped = tuple(axis - (axis > 2) * 2 for axis in dropped if axis not in (1, 2))
+            counts = counts + self.undated_counts.sum(axis=dropped, dtype=np.int64)
+            ounces = ounces + self.undated_ounces.sum(axis=dropped)
+
+        kept = sorted(axes)
+        for dim, axis in zip(dims, axes):
+            if dim in DATE_GROUPS:
+                position = kept.index(axis)
+                days = np.arange(self.first_day, self.first_day + self.counts.shape[1])
+                groups = np.eye(len(self.labels(dim)))[DATE_GROUPS[dim](days)]
+                counts = np.moveaxis(np.moveaxis(counts, position, -1) @ groups, -1, position).round().astype(np.int64)
+                ounces = np.moveaxis(np.moveaxis(ounces, position, -1) @ groups, -1, position)
+        order = [kept.index(axis) for axis in axes]
+        counts, ounces = counts.transpose(order), ounces.transpose(order)
+        counts.flags.writeable = ounces.flags.writeable = False
+        return counts, ounces
+
+    def _marginal(self, kept):
+        """Dated counts and ounces summed over every axis but ``kept``.
+
+        Each is summed from the smallest marginal already held that covers
+        ``kept``, so tables within person × date × hour or person × format ×
+        drink type never read the full cube.
+        """
+        if kept in self._marginals:
+            return self._marginals[kept]
+        held = [axes for axes in self._marginals if set(kept) <= set(axes)]
+        if held:
+            source = min(held, key=lambda axes: self._marginals[axes][0].size)
+            counts, ounces = self._marginals[source]
+        else:
+            source = tuple(range(len(AXES)))
+            counts, ounces = self.counts, self.ounces
+            for block in [(0, 1, 2), (0, 3, 4)]:
+                if set(kept) < set(block):
+                    source = block
+                    counts, ounces = self._marginal(block)
+                    break
+        summed = tuple(position for position, axis in enumerate(source) if axis not in kept)
+        self._marginals[kept] = (counts.sum(axis=summed, dtype=np.int64), ounces.sum(axis=summed, dtype=np.float64))
+        return self._marginals[kept]
+
+    def table(self, *dims):
+        """Long table of ``dims`` plus ``count`` and ``ounces``, one row per combination logged, sorted by ``dims``.
+
+        Like a ``groupby`` over the rows with ``observed=True``: missing values
+        and empty combinations are left out.
+        """
+        counts, ounces = self.sums(*dims)
+        logged = tuple(slice(0, len(self.labels(dim))) for dim in dims)
+        counts, ounces = counts[logged], ounces[logged]
+        cells = np.nonzero(counts)
+        table = pd.DataFrame({dim: self.labels(dim).take(codes) for dim, codes in zip(dims, cells)})
+        table["count"] = counts[cells]
+        table["ounces"] = ounces[cells]
+        return table
+
+    def crosstab(self, rows, columns):
+        """Drink counts with one row per ``rows`` value and one column per ``columns`` value, zeros included."""
+        counts, _ = self.sums(rows, columns)
+        row_labels, column_labels = self.labels(rows), self.labels(columns)
+        return pd.DataFrame(
+            counts[:len(row_labels), :len(column_labels)],
+            index=pd.Index(row_labels, name=rows),
+            columns=pd.Index(column_labels, name=columns)
+        )
+
+    def leaderboard(self):
+        """Same table as ``aggregates.leaderboard``."""
+        drinks, ounces = self.sums("person")
+        daily, _ = self.sums("person", "date")
+        days_active = (daily > 0).sum(axis=1)
+        board = pd.DataFrame({
+            "total_drinks": drinks,
+            "total_ounces": ounces,
+            "avg_daily_drinks": np.divide(drinks, days_active, out=np.zeros(len(drinks)), where=days_active > 0)
+        }, index=pd.CategoricalIndex(self.people, name="person"))
+        return board[board["total_drinks"] > 0].sort_values("total_drinks", ascending=False)
+
+    def day_counts(self, start, end):
+        """Drinks per player per day from ``start`` through ``end``, as a ``(players, days)`` array."""
+        start = int(np.datetime64(start, "D").astype(np.int64))
+        end = int(np.datetime64(end, "D").astype(np.int64))
+        daily, _ = self.sums("person", "date")
+        out = np.zeros((len(self.people), end - start + 1), dtype=np.int64)
+        first, last = max(start, self.first_day), min(end + 1, self.first_day + daily.shape[1])
+        if first < last:
+            out[:, first - start:last - start] = daily[:, first - self.first_day:last - self.first_day]
+        return out
@@ -0,0 +1,60 @@
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """Indices of the points Largest-Triangle-Three-Buckets keeps when reducing a series to ``threshold`` points."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    kept = np.empty(threshold, dtype=int)
+    kept[0] = 0
+    kept[-1] = n - 1
+
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        areas = np.abs(
+            (x[selected] - next_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (next_y - y[selected])
+        )
+        selected = start + int(areas.argmax())
+        kept[bucket + 1] = selected
+
+    return kept
+
+
+def crossing_indices(y, level):
+    """Indices on both sides of every point where ``y`` crosses ``level``."""
+    above = np.asarray(y) >= level
+    crossings = np.flatnonzero(above[1:] != above[:-1])
+    return np.concatenate((crossings, crossings + 1))
+
+
+def downsample_series(df, x, y, by, max_points, keep_level=None):
+    """Cap every ``by`` group of ``df`` at about ``max_points`` rows, keeping the shape of ``y`` over ``x``.
+
+    Points either side of a crossing of ``keep_level`` are always kept, so
+    lines still cross a goal marker where the raw data does.
+    """
+    keep = []
+    for _, group in df.groupby(by, sort=False):
+        xs = group[x].to_numpy()
+        if np.issubdtype(xs.dtype, np.datetime64):
+            xs = xs.astype("datetime64[ns]").astype(np.int64)
+        ys = group[y].to_numpy()
+        indices = lttb(xs, ys, max_points)
+        if keep_level is not None:
+            indices = np.union1d(indices, crossing_indices(ys, keep_level))
+        keep.append(group.index.to_numpy()[indices])
+
+    if not keep:
+        return df
+    return df.loc[np.concatenate(keep)].sort_values(x, kind="stable")
@@ -0,0 +1,197 @@
+import html
+import json
+import os
+import re
+import shutil
+from datetime import date, datetime
+
+import pandas as pd
+
+from tracker.aggregates import dashboard_aggregates
+from tracker.charts import DC_BLACK, DC_DARK_SILVER, DC_LIGHT_GRAY, DC_RED, DC_WHITE, dashboard_figures, player_colors
+from tracker.cube import DrinkCube
+from tracker.forecast import forecast_year_end
+from tracker.heatmap import season_heatmaps
+from tracker.stats import data_version, player_summary, records
+
+MANIFEST = "manifest.json"
+PLOTLY_JS = "plotly.min.js"
+FIGURE_ORDER = ["cumulative", "drinks", "hourly", "daily", "format", "type", "hour_weekday"]
+
+PAGE_STYLE = f"""
+@import url('https://fonts.googleapis.com/css2?family=Bebas+Neue&family=Open+Sans:wght@400;600;700&display=swap');
+body {{ margin: 0; padding: 20px 40px; font-family: 'Open Sans', sans-serif; color: {DC_BLACK};
+       background: linear-gradient(135deg, {DC_WHITE} 0%, {DC_LIGHT_GRAY} 100%); }}
+h1 {{ font-family: 'Bebas Neue', sans-serif; font-size: 4rem; color: {DC_RED}; text-align: center; letter-spacing: 3px; margin: 10px 0 0; }}
+h2 {{ font-family: 'Bebas Neue', sans-serif; font-size: 2rem; letter-spacing: 2px; border-bottom: 3px solid {DC_RED}; }}
+h3 {{ font-family: 'Bebas Neue', sans-serif; font-size: 2.2rem; margin: 0; }}
+nav, .as-of {{ text-align: center; color: {DC_DARK_SILVER}; }}
+nav a {{ color: {DC_RED}; margin: 0 8px; }}
+table {{ border-collapse: collapse; width: 100%; background: white; }}
+th, td {{ padding: 8px 12px; text-align: right; border-bottom: 1px solid {DC_LIGHT_GRAY}; }}
+th:nth-child(2), td:nth-child(2) {{ text-align: left; }}
+.charts {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(560px, 1fr)); gap: 20px; }}
+.card {{ background: white; border-radius: 20px; padding: 25px 30px; margin: 20px 0; box-shadow: 0 8px 25px rgba(0,0,0,0.1); }}
+.stats {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 12px; margin-top: 15px; }}
+.stats span {{ display: block; font-size: 0.75rem; color: {DC_DARK_SILVER}; text-transform: uppercase; letter-spacing: 1px; }}
+.stats b {{ font-family: 'Bebas Neue', sans-serif; font-size: 1.5rem; font-weight: normal; }}
+"""
+
+
+def slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", str(text).lower()).strip("-") or "unnamed"
+
+
+def bundle_version(out_dir):
+    """Data version of the bundle already in ``out_dir``, or None if there isn't one."""
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            return json.load(f).get("version")
+    except (OSError, ValueError):
+        return None
+
+
+def _seasons(df, year):
+    """``(season, league, frame)`` for each season in ``df``, newest first, like the dashboard's picker."""
+    if "season" not in df.columns or "league" not in df.columns:
+        return [(year, None, df)]
+    groups = df.groupby(["season", "league"], observed=True)
+    keys = sorted(groups.groups, key=lambda key: (-int(key[0]), str(key[1])))
+    if not keys:
+        return [(year, None, df)]
+    return [(int(season), str(league), groups.get_group((season, league)).reset_index(drop=True)) for season, league in keys]
+
+
+def _page_name(season, league):
+    return f"{season}-{slug(league)}" if league is not None else str(season)
+
+
+def _player_card(person, stats, color, heatmap):
+    hour = stats["favorite_hour"]
+    peak_hour = f"{hour % 12 or 12} {'AM' if hour < 12 else 'PM'}" if hour is not None else "N/A"
+    max_date = f" ({stats['max_drinks_date'].strftime('%m/%d')})" if stats["max_drinks_date"] else ""
+    cells = [
+        ("Total Drinks", f"{stats['total_drinks']:,}"),
+        ("Total Ounces", f"{stats['total_ounces']:,.0f}"),
+        ("Days Active", f"{stats['days_active']}"),
+        ("Avg Drinks/Day", f"{stats['avg_daily_drinks']:.1f}"),
+        ("Current Streak", f"{stats['current_streak']} days"),
+        ("Longest Streak", f"{stats['longest_streak']} days"),
+        ("Max in One Day", f"{stats['max_drinks_one_day']}{max_date}"),
+        ("DC Loyalty", f"{stats['pct_diet_coke']:.0f}%"),
+        ("Peak Hour", peak_hour),
+        ("Predicted Year-End", f"{stats['predicted_drinks']:,} ({stats['predicted_drinks_low']:,}–{stats['predicted_drinks_high']:,})"),
+        ("Predicted Ounces", f"{stats['predicted_ounces']:,} ({stats['predicted_ounces_low']:,}–{stats['predicted_ounces_high']:,})")
+    ]
+    stats_html = "".join(f"<div><span>{label}</span><b>{html.escape(value)}</b></div>" for label, value in cells)
+    return (
+        f'<div class="card" style="border-top: 5px solid {color};">'
+        f'<h3 style="color: {color};">{html.escape(str(person).upper())}</h3>'
+        f'{heatmap}<div class="stats">{stats_html}</div></div>'
+    )
+
+
+def _write_season(df, path, season, league, nav, goal_ounces, today, as_of):
+    cube = DrinkCube(df, season)
+    aggregates = dashboard_aggregates(df, goal_ounces=goal_ounces, cube=cube)
+    aggregates["hour_weekday"] = cube.crosstab("day_of_week", "hour")
+    colors = player_colors(aggregates["people"])
+    figures = dashboard_figures(aggregates, colors, goal_ounces)
+    leaderboard = aggregates["leaderboard"]
+    ranked = leaderboard.index.tolist()
+    stats = player_summary(df, ranked, today=today, year=season, forecast=forecast_year_end(df, today, season), cube=cube)
+
+    heatmaps = season_heatmaps(cube, colors, season)
+
+    os.makedirs(os.path.join(path, "figures"))
+    os.makedirs(os.path.join(path, "heatmaps"))
+    for name, fig in figures.items():
+        with open(os.path.join(path, "figures", f"{name}.json"), "w") as f:
+            f.write(fig.to_json())
+    for person, svg in heatmaps.items():
+        with open(os.path.join(path, "heatmaps", f"{slug(person)}.svg"), "w") as f:
+            f.write(svg)
+    with open(os.path.join(path, "stats.json"), "w") as f:
+        json.dump({
+            "season": season,
+            "league": league,
+            "as_of": as_of.isoformat() if as_of else None,
+            "leaderboard": records(leaderboard),
+            "players": records(stats)
+        }, f, indent=2)
+
+    rows = "".join(
+        f"<tr><td>{rank}</td><td style=\"color: {colors.get(person, DC_BLACK)};\">{html.escape(str(person))}</td>"
+        f"<td>{row.total_drinks:,}</td><td>{row.total_ounces:,.0f}</td><td>{row.avg_daily_drinks:.2f}</td></tr>"
+        for rank, (person, row) in enumerate(leaderboard.iterrows(), start=1)
+    )
+    charts = "".join(
+        f'<div class="card">{figures[name].to_html(full_html=False, include_plotlyjs=False, config={"responsive": True})}</div>'
+        for name in FIGURE_ORDER if name in figures
+    )
+    cards = "".join(_player_card(person, stats.loc[person], colors[person], heatmaps.get(person, "")) for person in ranked)
+    title = f"Diet Coke Tracker {season}" + (f" · {league}" if league is not None else "")
+    as_of_text = as_of.strftime("%m/%d/%Y %I:%M %p") if as_of else datetime.now().strftime("%m/%d/%Y %I:%M %p")
+
+    with open(os.path.join(path, "index.html"), "w") as f:
+        f.write(
+            f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+            f'<meta name="viewport" content="width=1200"><style>{PAGE_STYLE}</style>'
+            f'<script src="../{PLOTLY_JS}"></script></head><body>'
+            f'<h1>{html.escape(title.upper())}</h1><p class="as-of">Data as of {as_of_text}</p>{nav}'
+            f'<h2>LEADERBOARD</h2><table><tr><th>#</th><th>Player</th><th>Drinks</th><th>Ounces</th><th>Avg/Day</th></tr>{rows}</table>'
+            f'<h2>TRENDS AND PATTERNS</h2><div class="charts">{charts}</div>'
+            f'<h2>PLAYER STATS</h2>{cards}</body></html>'
+        )
+
+
+def export_bundle(df, out_dir, version=None, goal_ounces=5000, today=None, as_of=None):
+    """Render every season in ``df`` into a static site under ``out_dir``, unless it already holds this data version.
+
+    Each season gets a page with the leaderboard, every dashboard chart, the
+    calendar heatmaps and player stats, plus the figures as Plotly JSON, the
+    heatmaps as SVG files and the tables as ``stats.json``. The bundle is
+    built next to ``out_dir`` and swapped in whole, so a file server never
+    serves half of one version. Returns whether a new bundle was written.
+    """
+    from plotly.offline import get_plotlyjs
+
+    version = version or data_version(df)
+    if bundle_version(out_dir) == version:
+        return False
+    if today is None:
+        today = date.today()
+    latest = df["datetime"].max()
+    seasons = _seasons(df, latest.year if pd.notna(latest) else today.year)
+
+    staging, previous = f"{out_dir}.tmp", f"{out_dir}.old"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    with open(os.path.join(staging, PLOTLY_JS), "w") as f:
+        f.write(get_plotlyjs())
+
+    pages = [(_page_name(season, league), season, league) for season, league, _ in seasons]
+    links = "".join(
+        f'<a href="../{name}/index.html">{season}{f" · {html.escape(league)}" if league is not None else ""}</a>'
+        for name, season, league in pages
+    )
+    nav = f"<nav>{links}</nav>" if len(pages) > 1 else ""
+    for (name, _, _), (season, league, season_df) in zip(pages, seasons):
+        _write_season(season_df, os.path.join(staging, name), season, league, nav, goal_ounces, today, as_of)
+
+    with open(os.path.join(staging, "index.html"), "w") as f:
+        f.write(f'<!DOCTYPE html><html><head><meta http-equiv="refresh" content="0; url={pages[0][0]}/index.html"></head></html>')
+    with open(os.path.join(staging, MANIFEST), "w") as f:
+        json.dump({
+            "version": version,
+            "as_of": as_of.isoformat() if as_of else None,
+            "exported_at": datetime.now().isoformat(),
+            "pages": [f"{name}/index.html" for name, _, _ in pages]
+        }, f, indent=2)
+
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(out_dir):
+        os.replace(out_dir, previous)
+    os.replace(staging, out_dir)
+    shutil.rmtree(previous, ignore_errors=True)
+    return True
@@ -0,0 +1,229 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from tracker.schema import weekday
+from tracker.window import sort_by_time
+
+HALF_LIFE_DAYS = 14
+WEEKDAY_PRIOR_DAYS = 2
+SEASONAL_CLIP = (0.2, 5.0)
+INTERVAL_Z = 1.2816  # 80% interval
+
+FORECAST_COLUMNS = [
+    "predicted_drinks",
+    "predicted_drinks_low",
+    "predicted_drinks_high",
+    "predicted_ounces",
+    "predicted_ounces_low",
+    "predicted_ounces_high"
+]
+
+
+def _day_numbers(values):
+    return values.astype("datetime64[D]").astype(np.int64)
+
+
+def _checksum(people, days, ounces):
+    rows = pd.DataFrame({"person": people, "day": days, "ounces": ounces})
+    return int(pd.util.hash_pandas_object(rows, index=False).sum())
+
+
+class SeasonalForecast:
+    """Year-end forecasts for every player in season ``year`` at once, folded forward one day at a time.
+
+    Each player's daily drinks and ounces are modelled as an exponentially
+    weighted level times a day-of-week factor. Completed days are folded into
+    the state once; later updates only fold the days that have finished since,
+    and refit from scratch if rows for days already folded are added, removed
+    or edited (a checksum of the folded rows catches edits).
+
+    Only rows dated within ``year`` count, so a mistyped year can't stretch the
+    fold over decades, and rows dated after today are left out until their
+    day comes rather than counted on top of the forecast for it.
+    """
+
+    def __init__(self, year, half_life=HALF_LIFE_DAYS):
+        self.year = year
+        self.year_start = int(np.datetime64(f"{year}-01-01", "D").astype(np.int64))
+        self.year_end = int(np.datetime64(f"{year}-12-31", "D").astype(np.int64))
+        self.alpha = 1 - 0.5 ** (1 / half_life)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.people = pd.Index([], dtype=object)
+        self.folded_through = None
+        self.folded_rows = 0
+        self.folded_checksum = 0
+        self.today = None
+        self.first_day = np.empty(0, dtype=np.int64)
+        self.days_active = np.empty(0, dtype=np.int64)
+        self.level = np.empty((0, 2))
+        self.resid_var = np.empty((0, 2))
+        self.weekday_sum = np.empty((0, 7, 2))
+        self.weekday_days = np.empty((0, 7))
+        self.total = np.empty((0, 2))
+        self.pending_today = np.empty((0, 2))
+
+    def update(self, df, today):
+        """Fold every complete day before ``today`` from ``df``, which must include all rows seen so far."""
+        with self._lock:
+            self._update(df, today)
+        return self
+
+    def _update(self, df, today):
+        if not df["datetime"].is_monotonic_increasing or df["datetime"].hasnans:
+            df = sort_by_time(df)
+        logged = (df["datetime"].notna() & df["person"].notna()).to_numpy()
+        days = _day_numbers(df["datetime"].to_numpy()[logged])
+        in_season = (days >= self.year_start) & (days <= self.year_end)
+        days = days[in_season]
+        people = df["person"].array[logged][in_season]
+        ounces = df["ounces"].to_numpy(dtype=np.float64)[logged][in_season]
+        today = int(np.datetime64(today, "D").astype(np.int64))
+        # Days before ``end`` are complete; a finished season stops at its last day.
+        end = min(today, self.year_end + 1)
+
+        start = 0
+        if self.folded_through is not None:
+            start = int(np.searchsorted(days, self.folded_through, side="left"))
+            if (
+                start != self.folded_rows or end < self.folded_through
+                or _checksum(people[:start], days[:start], ounces[:start]) != self.folded_checksum
+            ):
+                self._reset()
+                start = 0
+
+        codes = self._codes(people[start:], days[start:])
+        people, days, ounces = people[start:], days[start:], ounces[start:]
+        complete = int(np.searchsorted(days, end, side="left"))
+
+        first = self.folded_through
+        if first is None:
+            first = int(days[0]) if len(days) else end
+        if first < end:
+            self._fold(codes[:complete], days[:complete], ounces[:complete], first, end)
+            self.folded_through = end
+            self.folded_rows += complete
+            self.folded_checksum = (
+                self.folded_checksum + _checksum(people[:complete], days[:complete], ounces[:complete])
+            ) & 0xFFFFFFFFFFFFFFFF
+        elif self.folded_through is None:
+            self.folded_through = first
+
+        self.today = today
+        on_today = days[complete:] == today
+        values = np.stack([np.ones(on_today.sum()), ounces[complete:][on_today]], axis=1)
+        self.pending_today = self._sum_by_player(codes[complete:][on_today], values)
+
+    def _codes(self, people, days):
+        codes, names = pd.factorize(people)
+        new = pd.Index(names, dtype=object).difference(self.people, sort=False)
+        if len(new):
+            self.people = self.people.append(new)
+            grow = len(new)
+            self.first_day = np.append(self.first_day, np.full(grow, np.iinfo(np.int64).max))
+            self.days_active = np.append(self.days_active, np.zeros(grow, dtype=np.int64))
+            self.level = np.vstack([self.level, np.zeros((grow, 2))])
+            self.resid_var = np.vstack([self.resid_var, np.zeros((grow, 2))])
+            self.weekday_sum = np.concatenate([self.weekday_sum, np.zeros((grow, 7, 2))])
+            self.weekday_days = np.vstack([self.weekday_days, np.zeros((grow, 7))])
+            self.total = np.vstack([self.total, np.zeros((grow, 2))])
+        codes = self.people.get_indexer(pd.Index(names, dtype=object)).take(codes)
+        np.minimum.at(self.first_day, codes, days)
+        return codes
+
+    def _sum_by_player(self, codes, values):
+        n = len(self.people)
+        return np.stack([np.bincount(codes, weights=values[:, k], minlength=n) for k in range(2)], axis=1)
+
+    def _seasonal(self, weekdays):
+        """Day-of-week factors per player, shrunk towards 1, as a ``(players, len(weekdays), 2)`` array."""
+        mean = self.total / np.maximum(self.days_active, 1)[:, None]
+        weekday_mean = (self.weekday_sum[:, weekdays] + WEEKDAY_PRIOR_DAYS * mean[:, None]) / (
+            self.weekday_days[:, weekdays] + WEEKDAY_PRIOR_DAYS
+        )[..., None]
+        factor = np.divide(weekday_mean, mean[:, None], out=np.ones_like(weekday_mean), where=mean[:, None] > 0)
+        return np.clip(factor, *SEASONAL_CLIP)
+
+    def _fold(self, codes, days, ounces, first, end):
+        """Fold days ``first`` through ``end - 1`` into the state, with every player updated per day in one step."""
+        n, span = len(self.people), end - first
+        slot = codes * span + (days - first)
+        daily = np.stack([
+            np.bincount(slot, minlength=n * span),
+            np.bincount(slot, weights=ounces, minlength=n * span)
+        ], axis=-1).reshape(n, span, 2)
+
+        for offset in range(span):
+            day = first + offset
+            active = self.first_day <= day
+            if not active.any():
+                continue
+            day_of_week = weekday(day)
+            x = daily[active, offset]
+            seasonal = self._seasonal([day_of_week])[active, 0]
+            seen = self.days_active[active]
+
+            resid = x - self.level[active] * seasonal
+            var_rate = np.where(seen > 0, np.maximum(self.alpha, 1 / np.maximum(seen, 1)), 0)[:, None]
+            self.resid_var[active] += var_rate * (resid ** 2 - self.resid_var[active])
+            rate = np.maximum(self.alpha, 1 / (seen + 1))[:, None]
+            self.level[active] += rate * (x / seasonal - self.level[active])
+
+            self.weekday_sum[active, day_of_week] += x
+            self.weekday_days[active, day_of_week] += 1
+            self.total[active] += x
+            self.days_active[active] += 1
+
+    def predict(self):
+        """Predicted year-end drinks and ounces per player, with an 80% interval."""
+        with self._lock:
+            return self._predict()
+
+    def _predict(self):
+        if self.today is None or not len(self.people):
+            return pd.DataFrame(columns=FORECAST_COLUMNS, index=pd.Index([], name="person"), dtype=float)
+
+        start = max(self.today, self.year_start)
+        horizon = np.arange(start, self.year_end + 1)
+
+        level = self.level.copy()
+        resid_var = self.resid_var.copy()
+        fresh = self.days_active == 0
+        level[fresh] = self.pending_today[fresh]
+        few = self.days_active < 2
+        resid_var[few] = level[few] ** 2
+
+        seasonal = self._seasonal(np.arange(7))
+        weekday_counts = np.bincount(weekday(horizon), minlength=7)
+        expected = level * (seasonal * weekday_counts[None, :, None]).sum(axis=1)
+        if start == self.today and len(horizon):
+            expected_today = level * seasonal[:, weekday(self.today)]
+            expected += np.maximum(expected_today, self.pending_today) - expected_today - self.pending_today
+
+        actual = self.total + self.pending_today
+        predicted = actual + expected
+
+        seasonal_sum = (seasonal * weekday_counts[None, :, None]).sum(axis=1)
+        level_var = resid_var * self.alpha / (2 - self.alpha)
+        spread = INTERVAL_Z * np.sqrt(len(horizon) * resid_var + seasonal_sum ** 2 * level_var)
+        low = np.maximum(predicted - spread, actual)
+        high = predicted + spread
+
+        forecast = pd.DataFrame({
+            "predicted_drinks": predicted[:, 0],
+            "predicted_drinks_low": low[:, 0],
+            "predicted_drinks_high": high[:, 0],
+            "predicted_ounces": predicted[:, 1],
+            "predicted_ounces_low": low[:, 1],
+            "predicted_ounces_high": high[:, 1]
+        }, index=pd.Index(self.people, name="person"))
+        return forecast.round().astype(int)
+
+
+def forecast_year_end(df, today, year):
+    """One-off forecast for a frame, fitted from scratch."""
+    return SeasonalForecast(year).update(df, today).predict()
@@ -0,0 +1,93 @@
+from datetime import date
+
+import numpy as np
+
+from tracker.schema import weekday
+
+EMPTY_RGB = (235, 237, 240)
+EMPTY_FILL = "#EBEDF0"
+CELL_SIZE = 6
+CELL_GAP = 2
+MONTH_GAP = 8
+TOP_MARGIN = 12
+MONTH_LABELS = ["J", "F", "M", "A", "M", "J", "J", "A", "S", "O", "N", "D"]
+
+
+def _hex_to_rgb(color):
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _month_layout(start, end):
+    first_month = np.datetime64(start, "M")
+    months = np.arange(first_month, np.datetime64(end, "M") + 1)
+    month_starts = months.astype("datetime64[D]")
+    days_in_month = ((months + 1).astype("datetime64[D]") - month_starts).astype(int)
+    first_weekday = weekday(month_starts.astype(int))
+    weeks_in_month = (days_in_month + first_weekday + 6) // 7
+    widths = weeks_in_month * (CELL_SIZE + CELL_GAP)
+    offsets = np.concatenate(([0], np.cumsum(widths + MONTH_GAP)[:-1]))
+    return months, month_starts, first_weekday, widths, offsets
+
+
+def _year_bounds(start, end):
+    if start is None:
+        start = date(date.today().year, 1, 1)
+    if end is None:
+        end = date(start.year, 12, 31)
+    return start, end
+
+
+def season_heatmaps(cube, colors, year):
+    """A calendar heatmap of season ``year`` for every player in ``colors``, from a ``DrinkCube``'s daily counts."""
+    start, end = date(year, 1, 1), date(year, 12, 31)
+    counts = cube.day_counts(start, end)
+    return {
+        person: calendar_svg(counts[index], colors[person], start, end)
+        for index, person in enumerate(cube.people)
+        if person in colors
+    }
+
+
+def calendar_svg(counts, color, start=None, end=None):
+    """Calendar heatmap from ``counts``, the drinks on each day from ``start`` through ``end``.
+
+    Cells are grouped by colour into one ``<path>`` each, so the SVG size
+    depends on the number of distinct daily counts rather than the number of days.
+    """
+    start, end = _year_bounds(start, end)
+    months, month_starts, first_weekday, widths, offsets = _month_layout(start, end)
+
+    days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+    counts = np.asarray(counts)
+
+    month_index = (days.astype("datetime64[M]") - months[0]).astype(int)
+    day_of_month = (days - month_starts[month_index]).astype(int)
+    slot = day_of_month + first_weekday[month_index]
+    xs = offsets[month_index] + (slot // 7) * (CELL_SIZE + CELL_GAP)
+    ys = TOP_MARGIN + (slot % 7) * (CELL_SIZE + CELL_GAP)
+
+    max_count = max(counts.max(initial=0), 1)
+    target = np.array(_hex_to_rgb(color))
+    empty = np.array(EMPTY_RGB)
+
+    svg_parts = [
+        f'<text x="{offset + width / 2}" y="8" font-size="8" fill="#8A8A8A" text-anchor="middle" '
+        f'font-family="Open Sans, sans-serif">{MONTH_LABELS[int(month) % 12]}</text>'
+        for month, offset, width in zip(months.astype(int), offsets, widths)
+    ]
+    for count in np.unique(counts):
+        if count == 0:
+            fill = EMPTY_FILL
+        else:
+            r, g, b = (empty + (target - empty) * min(count / max_count, 1.0)).astype(int)
+            fill = f"rgb({r},{g},{b})"
+        cells = np.flatnonzero(counts == count)
+        path = "".join(
+            f"M{x} {y}h{CELL_SIZE}v{CELL_SIZE}h-{CELL_SIZE}z" for x, y in zip(xs[cells], ys[cells])
+        )
+        svg_parts.append(f'<path fill="{fill}" d="{path}"/>')
+
+    total_width = int(offsets[-1] + widths[-1])
+    total_height = TOP_MARGIN + 7 * (CELL_SIZE + CELL_GAP)
+    return f'<svg width="{total_width}" height="{total_height}" xmlns="http://www.w3.org/2000/svg">{"".join(svg_parts)}</svg>'
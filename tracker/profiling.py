@@ -0,0 +1,90 @@
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger("tracker.profile")
+if not logger.handlers:
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_current = ContextVar("tracker_profile", default=None)
+
+
+class RunProfile:
+    """Wall time per dashboard section plus cache misses and facts for a single script run.
+
+    Sections are sequential: ``start(name)`` closes whichever section was open.
+    """
+
+    def __init__(self, event="rerun"):
+        self.event = event
+        self.finished = False
+        self.sections = {}
+        self.misses = []
+        self.facts = {}
+        self._started = time.perf_counter()
+        self._section = None
+        self._section_started = None
+
+    def start(self, name):
+        self._close_section()
+        self._section = name
+        self._section_started = time.perf_counter()
+
+    def note(self, **facts):
+        self.facts.update(facts)
+
+    def finish(self):
+        self._close_section()
+        self.facts["total_ms"] = round((time.perf_counter() - self._started) * 1000, 2)
+        self.finished = True
+        logger.info(json.dumps({
+            "event": self.event,
+            "sections_ms": self.sections,
+            "cache_misses": self.misses,
+            **self.facts
+        }, default=str))
+        _current.set(None)
+
+    def _close_section(self):
+        if self._section is not None:
+            elapsed = (time.perf_counter() - self._section_started) * 1000
+            self.sections[self._section] = round(self.sections.get(self._section, 0) + elapsed, 2)
+            self._section = None
+
+
+def start_run(event="rerun"):
+    profile = RunProfile(event)
+    _current.set(profile)
+    return profile
+
+
+@contextmanager
+def section(name):
+    """Time a section of the current run, or profile it as a run of its own when a fragment reruns alone."""
+    profile = _current.get()
+    if profile is not None and not profile.finished:
+        profile.start(name)
+        yield profile
+        return
+
+    profile = start_run(event="fragment")
+    profile.note(fragment=name)
+    profile.start(name)
+    try:
+        yield profile
+    finally:
+        profile.finish()
+
+
+def record_miss(name):
+    """Called from inside cached functions, which only execute on a cache miss."""
+    profile = _current.get()
+    if profile is not None:
+        profile.misses.append(name)
@@ -0,0 +1,92 @@
+import logging
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+from tracker.stats import data_version
+
+logger = logging.getLogger("tracker.refresher")
+
+Snapshot = namedtuple("Snapshot", ["df", "version", "as_of"])
+
+
+class BackgroundRefresher:
+    """Polls ``load`` on a daemon thread and swaps in each result as an immutable snapshot.
+
+    Readers call ``current()`` and always get the latest snapshot immediately;
+    only the very first call blocks when there's nothing to serve yet. Every
+    reader shares one frame: ``current()`` hands out a shallow view of it, and
+    pandas 3's copy-on-write makes a reader that assigns to its frame copy
+    just the columns it touches, so the shared snapshot never changes.
+
+    ``on_change(snapshot)`` runs on the refresher thread after each pass that
+    finds a data version it hasn't seen, starting with the first snapshot.
+    """
+
+    def __init__(self, load, interval=300, initial=None, on_change=None):
+        self._load = load
+        self.interval = interval
+        self.on_change = on_change
+        self.error = None
+        self._snapshot = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._finished = threading.Condition()
+        self._wake = threading.Event()
+        self._thread = None
+        self._seen_version = None
+
+        if initial is not None:
+            self._snapshot = Snapshot(initial, data_version(initial), None)
+
+    def start(self):
+        if self._thread is None:
+            if self._snapshot is None or self._snapshot.as_of is None:
+                self._wake.set()
+            self._thread = threading.Thread(target=self._run, name="sheet-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def current(self):
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._refresh()
+        snapshot = self._snapshot
+        return snapshot._replace(df=snapshot.df.copy(deep=False))
+
+    def refresh_now(self, timeout=None):
+        """Wake the refresher and wait up to ``timeout`` seconds for it to finish a pass."""
+        with self._finished:
+            target = self._generation + 1
+            self._wake.set()
+            return self._finished.wait_for(lambda: self._generation >= target, timeout)
+
+    def _refresh(self):
+        df = self._load()
+        self._snapshot = Snapshot(df, data_version(df), datetime.now())
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                with self._lock:
+                    self._refresh()
+                self.error = None
+            except Exception as exc:
+                self.error = exc
+            with self._finished:
+                self._generation += 1
+                self._finished.notify_all()
+            self._notify_change()
+
+    def _notify_change(self):
+        snapshot = self._snapshot
+        if self.on_change is None or snapshot is None or snapshot.version == self._seen_version:
+            return
+        self._seen_version = snapshot.version
+        try:
+            self.on_change(snapshot)
+        except Exception:
+            logger.exception("on_change failed for data version %s", snapshot.version)
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+HEADER_ALIASES = {
+    "Timestamp": "timestamp",
+    "Who are you": "person",
+    "DC or inferior product?": "drink_type",
+    "DC or inferior produ": "drink_type",
+    "Date & time": "datetime",
+    "Format": "format",
+    "Ounces": "ounces",
+    "Additional notes?": "notes",
+    "AM only: is this the first beverage you've had today?": "first_beverage",
+    "AM only: is this the first beverage you've had": "first_beverage"
+}
+
+DAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def weekday(days):
+    """Weekday of day numbers counted from 1970-01-01, with Monday as 0 like ``DAY_ORDER`` and pandas' ``dayofweek``."""
+    # Day 0 of the epoch was a Thursday.
+    return (days + 3) % 7
+
+
+DTYPES = {
+    "person": "category",
+    "drink_type": "category",
+    "format": "category",
+    "first_beverage": "category",
+    "day_of_week": pd.CategoricalDtype(DAY_ORDER, ordered=True),
+    "hour": "Int8",
+    "week": "UInt8",
+    "month": "Int8",
+    "ounces": "float32",
+    "season": "Int16",
+    "league": "category"
+}
+
+DEFAULT_OUNCES = 12
+
+
+def map_headers(columns):
+    """Rename form headers to column names in one pass, tolerating truncated or extended question text."""
+    mapping = {}
+    assigned = set()
+    for col in columns:
+        name = col.strip()
+        for header, target in HEADER_ALIASES.items():
+            if target not in assigned and name and (name.startswith(header) or header.startswith(name)):
+                mapping[col] = target
+                assigned.add(target)
+                break
+        else:
+            mapping[col] = name
+    return mapping
+
+
+def parse_ounces(values):
+    # Plain numbers take the fast numeric path; only leftovers like "20 oz" go through the regex.
+    ounces = pd.to_numeric(values, errors="coerce")
+    leftover = ounces.isna() & values.notna()
+    if leftover.any():
+        cleaned = values[leftover].astype(str).str.replace(r"[^\d.]", "", regex=True)
+        ounces[leftover] = pd.to_numeric(cleaned, errors="coerce")
+    return ounces.fillna(DEFAULT_OUNCES)
+
+
+def normalize(df):
+    df = df.rename(columns=map_headers(df.columns))
+
+    df["datetime"] = pd.to_datetime(df["datetime"], errors="coerce")
+    when = df["datetime"].dt
+    df["date"] = when.floor("D")
+    df["hour"] = when.hour
+    weekday_codes = when.dayofweek.fillna(-1).astype(np.int8)
+    df["day_of_week"] = pd.Categorical.from_codes(weekday_codes, dtype=DTYPES["day_of_week"])
+    df["week"] = when.isocalendar().week
+    df["month"] = when.month
+    df["ounces"] = parse_ounces(df["ounces"])
+
+    df = df.astype({col: dtype for col, dtype in DTYPES.items() if col in df.columns})
+    drink_types = df["drink_type"].cat.categories.str.lower().str.contains("diet coke")
+    df["is_diet_coke"] = np.append(drink_types, False)[df["drink_type"].cat.codes]
+
+    return df
+
+
+def concat_frames(frames):
+    """Concatenate normalized frames, unioning categories so categorical columns stay categorical."""
+    frames = [frame for frame in frames if frame is not None]
+    for col, dtype in DTYPES.items():
+        if dtype != "category":
+            continue
+        present = [frame[col].astype("category") for frame in frames if col in frame.columns]
+        if not present:
+            continue
+        categories = pd.api.types.union_categoricals(present).categories
+        frames = [
+            frame.assign(**{col: frame[col].astype("category").cat.set_categories(categories)})
+            if col in frame.columns else frame
+            for frame in frames
+        ]
+    df = pd.concat(frames, ignore_index=True)
+    return df.astype({col: dtype for col, dtype in DTYPES.items() if col in df.columns and dtype != "category"})
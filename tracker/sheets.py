@@ -0,0 +1,332 @@
+import os
+import random
+import re
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pandas as pd
+
+from tracker.schema import concat_frames, normalize
+from tracker.snapshot import load_snapshot, save_snapshot
+from tracker.streaming import StreamingAggregates
+from tracker.window import sort_by_time
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets.readonly",
+    "https://www.googleapis.com/auth/drive.readonly"
+]
+
+
+def authorize(service_account_info):
+    """A gspread client for a service account. Google libraries are only imported when this is called."""
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    creds = Credentials.from_service_account_info(service_account_info, scopes=SCOPES)
+    return gspread.authorize(creds)
+
+
+RETRY_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 32.0
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+def retry_delay(exc, attempt, base=RETRY_BASE_SECONDS, cap=RETRY_MAX_SECONDS):
+    """Seconds to wait before retrying after ``exc``, or ``None`` if retrying won't help.
+
+    Rate limits and server errors back off exponentially with jitter unless
+    the response says how long to wait; connection errors and timeouts
+    (``OSError`` subclasses in requests) retry the same way.
+    """
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is None:
+        if not isinstance(exc, OSError):
+            return None
+    elif status not in RETRY_STATUSES:
+        return None
+
+    retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+    if retry_after.isdigit():
+        return min(float(retry_after), cap)
+    return min(cap, base * 2 ** attempt) * random.uniform(0.5, 1)
+
+
+def with_backoff(call, attempts=RETRY_ATTEMPTS, sleep=time.sleep):
+    for attempt in range(attempts):
+        try:
+            return call()
+        except Exception as exc:
+            delay = retry_delay(exc, attempt)
+            if delay is None or attempt == attempts - 1:
+                raise
+            sleep(delay)
+
+
+class RequestQuota:
+    """Keeps a client shared by several syncs under a per-minute quota.
+
+    A token bucket holding up to a minute's worth of requests: bursts, like
+    every source fetching at once, go straight through, and only a sustained
+    rate above ``per_minute`` waits. Callers that find the bucket empty
+    queue for the next tokens in arrival order.
+    """
+
+    def __init__(self, per_minute):
+        self.per_minute = per_minute
+        self._tokens = float(per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.per_minute, self._tokens + (now - self._updated) * self.per_minute / 60) - 1
+            self._updated = now
+            wait = -self._tokens * 60 / self.per_minute
+        if wait > 0:
+            time.sleep(wait)
+
+
+class SingleFlight:
+    """Runs one call at a time; callers that arrive while it's running wait for it and share its outcome."""
+
+    def __init__(self):
+        self._finished = threading.Condition()
+        self._running = False
+        self._generation = 0
+        self._result = None
+        self._error = None
+
+    def do(self, call):
+        with self._finished:
+            if self._running:
+                generation = self._generation
+                self._finished.wait_for(lambda: self._generation != generation)
+                if self._error is not None:
+                    raise self._error
+                return self._result
+            self._running = True
+
+        result, error = None, None
+        try:
+            result = call()
+        except Exception as exc:
+            error = exc
+        with self._finished:
+            self._running = False
+            self._generation += 1
+            self._result, self._error = result, error
+            self._finished.notify_all()
+        if error is not None:
+            raise error
+        return result
+
+
+def column_letter(index):
+    letters = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+class IncrementalSync:
+    """Keeps a normalized copy of a worksheet and only fetches rows appended since the last sync.
+
+    Works with anything exposing gspread's ``row_values`` and ``get_values``,
+    so a local fake worksheet can stand in for the real one. When a
+    ``snapshot_path`` is given the frame is seeded from the local snapshot
+    and saved back after every sync that adds rows. ``fetch()`` raises if
+    the sheet can't be reached, leaving ``df`` as it was. Each batch of new
+    rows is also folded into ``aggregates``, so the dashboard tables never
+    need a full recompute.
+
+    Each fetch re-reads the last row it already has. If that row has moved
+    or changed, rows above it were deleted or edited, and the whole sheet is
+    read again. Edits to any other row only show up after a full resync:
+    every ``full_sync_seconds``, or whenever ``reset()`` is called.
+
+    The worksheet handle is opened once and reused. Every request waits for
+    ``quota`` (a shared ``RequestQuota``) and retries with backoff, and
+    concurrent ``fetch()`` calls share a single request.
+    """
+
+    def __init__(self, open_worksheet, snapshot_path=None, quota=None, attempts=RETRY_ATTEMPTS, full_sync_seconds=None, snapshot_metadata=None):
+        self.open_worksheet = open_worksheet
+        self.snapshot_path = snapshot_path
+        self.snapshot_metadata = snapshot_metadata or {}
+        self.quota = quota
+        self.attempts = attempts
+        self.full_sync_seconds = full_sync_seconds
+        self.worksheet = None
+        self.header = None
+        self.last_row = 1
+        self.last_values = None
+        self.df = None
+        self.aggregates = StreamingAggregates()
+        self._header_checked = False
+        self._full_sync_due = False
+        self._full_synced_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+        if snapshot_path:
+            snapshot = load_snapshot(snapshot_path)
+            if snapshot is not None:
+                self.df, metadata = snapshot
+                self.last_row, self.header = metadata["last_row"], metadata["header"]
+                self.last_values = metadata.get("last_values")
+                self.aggregates.update(self.df)
+
+    def reset(self):
+        """Read the whole sheet again on the next fetch; the current frame is served until then."""
+        with self._lock:
+            self._full_sync_due = True
+            self._header_checked = False
+
+    def fetch(self):
+        return self._flight.do(self._locked_fetch)
+
+    def _locked_fetch(self):
+        with self._lock:
+            try:
+                self._fetch()
+            except Exception:
+                # Reopen on the next attempt in case the handle itself went bad.
+                self.worksheet = None
+                raise
+            return self.df
+
+    def _request(self, call, *args):
+        def attempt():
+            if self.quota is not None:
+                self.quota.acquire()
+            return call(*args)
+        return with_backoff(attempt, self.attempts)
+
+    def _fetch(self):
+        if self.worksheet is None:
+            self.worksheet = self._request(self.open_worksheet)
+
+        if not self._header_checked:
+            header = [col.strip() for col in self._request(self.worksheet.row_values, 1)]
+            if header != self.header:
+                self.header = header
+                self._full_sync_due = True
+            self._header_checked = True
+
+        full = self._full_sync_due or (
+            self.full_sync_seconds is not None and time.monotonic() - self._full_synced_at >= self.full_sync_seconds
+        )
+
+        width = len(self.header)
+        end_col = column_letter(width)
+        fetched = None
+        if not full and self.last_row > 1:
+            fetched = self._request(self.worksheet.get_values, f"A{self.last_row}:{end_col}")
+            if fetched and self._pad(fetched[0], width) == self.last_values:
+                fetched = fetched[1:]
+            else:
+                full = True
+        if full or fetched is None:
+            fetched = self._request(self.worksheet.get_values, f"A2:{end_col}")
+
+        rows = [self._pad(row, width) for row in fetched if any(str(value).strip() for value in row)]
+        if fetched:
+            self.last_values = self._pad(fetched[-1], width)
+        if full:
+            self.last_row = 1 + len(fetched)
+            self.df = None
+            self.aggregates = StreamingAggregates()
+            self._full_sync_due = False
+            self._full_synced_at = time.monotonic()
+        else:
+            self.last_row += len(fetched)
+
+        if rows or self.df is None:
+            batch = normalize(pd.DataFrame(rows, columns=self.header))
+            if self.df is None or self.df.empty:
+                self.df = batch
+            else:
+                self.df = concat_frames([self.df, batch])
+            self.aggregates.update(batch)
+            if self.snapshot_path:
+                save_snapshot(
+                    self.df, self.snapshot_path, self.last_row, self.header,
+                    last_values=self.last_values, **self.snapshot_metadata
+                )
+
+    @staticmethod
+    def _pad(row, width):
+        return [str(value) for value in row[:width]] + [""] * (width - len(row))
+
+
+SheetSource = namedtuple("SheetSource", ["sheet_id", "worksheet", "season", "league"])
+
+
+def snapshot_name(source):
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", f"{source.sheet_id}-{source.worksheet}-{source.season}-{source.league}").strip("-")
+    return f"{slug}.arrow"
+
+
+class MultiSourceSync:
+    """Syncs several worksheets concurrently and stacks them with ``season`` and ``league`` columns.
+
+    ``open_worksheet(source)`` returns the worksheet for a source; each source
+    keeps its own ``IncrementalSync`` and snapshot file under ``snapshot_dir``,
+    which records the source's season and league, and all of them share one
+    ``requests_per_minute`` quota.
+    """
+
+    def __init__(self, sources, open_worksheet, snapshot_dir=None, max_workers=4, requests_per_minute=None, full_sync_seconds=None):
+        self.sources = list(sources)
+        self.max_workers = max_workers
+        quota = RequestQuota(requests_per_minute) if requests_per_minute else None
+        self.syncs = [
+            IncrementalSync(
+                partial(open_worksheet, source),
+                snapshot_path=os.path.join(snapshot_dir, snapshot_name(source)) if snapshot_dir else None,
+                quota=quota,
+                full_sync_seconds=full_sync_seconds,
+                snapshot_metadata={"season": source.season, "league": source.league}
+            )
+            for source in self.sources
+        ]
+        self._flight = SingleFlight()
+
+    @property
+    def df(self):
+        frames = [sync.df for sync in self.syncs]
+        if any(frame is None for frame in frames):
+            return None
+        return self._combine(frames)
+
+    def fetch(self):
+        return self._flight.do(self._fetch_all)
+
+    def _fetch_all(self):
+        workers = max(1, min(self.max_workers, len(self.syncs)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sheet-sync") as pool:
+            frames = list(pool.map(lambda sync: sync.fetch(), self.syncs))
+        return self._combine(frames)
+
+    def aggregates(self, season, league):
+        """Streamed dashboard tables for one season and league, combined across its sources."""
+        states = [
+            sync.aggregates for source, sync in zip(self.sources, self.syncs)
+            if source.season == season and source.league == league
+        ]
+        if len(states) == 1:
+            return states[0]
+        return StreamingAggregates.combine(states) if states else None
+
+    def _combine(self, frames):
+        return sort_by_time(concat_frames([
+            frame.assign(season=source.season, league=source.league)
+            for source, frame in zip(self.sources, frames)
+        ]))
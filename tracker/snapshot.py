@@ -0,0 +1,50 @@
+import json
+import os
+
+SCHEMA_VERSION = 2
+METADATA_KEY = b"tracker"
+
+
+def save_snapshot(df, path, last_row, header, **extra):
+    """Write ``df`` to ``path`` with the sync position; ``extra`` keys are stored alongside and come back from ``load_snapshot``."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[METADATA_KEY] = json.dumps({
+        **extra,
+        "schema_version": SCHEMA_VERSION,
+        "last_row": last_row,
+        "header": header
+    }).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path):
+    """Return ``(df, metadata)`` from an Arrow snapshot, or None if missing or stale.
+
+    ``metadata`` holds ``last_row`` and ``header`` plus whatever extra keys were saved.
+    """
+    if not os.path.exists(path):
+        return None
+
+    import pyarrow as pa
+
+    try:
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+    metadata = json.loads((table.schema.metadata or {}).get(METADATA_KEY, b"{}"))
+    if metadata.get("schema_version") != SCHEMA_VERSION:
+        return None
+
+    return table.to_pandas(), metadata
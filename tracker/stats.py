@@ -0,0 +1,185 @@
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from tracker.cube import DrinkCube
+from tracker.forecast import FORECAST_COLUMNS, forecast_year_end
+
+SUMMARY_COLUMNS = [
+    "total_drinks",
+    "total_ounces",
+    "days_active",
+    "avg_daily_drinks",
+    "max_drinks_one_day",
+    "max_drinks_date",
+    "max_ounces_one_day",
+    "favorite_format",
+    "favorite_hour",
+    "pct_diet_coke",
+    "first_beverage_pct",
+    "current_streak",
+    "longest_streak",
+    *FORECAST_COLUMNS
+]
+
+SUMMARY_DEFAULTS = {
+    "total_drinks": 0,
+    "total_ounces": 0,
+    "days_active": 0,
+    "avg_daily_drinks": 0,
+    "max_drinks_one_day": 0,
+    "max_ounces_one_day": 0,
+    "favorite_format": "N/A",
+    "pct_diet_coke": 0,
+    "first_beverage_pct": 0,
+    "current_streak": 0,
+    "longest_streak": 0,
+    **{column: 0 for column in FORECAST_COLUMNS}
+}
+
+
+VERSION_COLUMNS = ["person", "datetime", "drink_type", "format", "ounces"]
+
+
+def data_version(df):
+    """Cheap fingerprint of a loaded frame: row count, the latest logged timestamp and a checksum of the stat columns.
+
+    The checksum catches rows edited in place, which keep the count and usually the latest time.
+    """
+    if df.empty:
+        return "0"
+    columns = [col for col in VERSION_COLUMNS if col in df.columns]
+    checksum = int(pd.util.hash_pandas_object(df[columns], index=False).sum()) & 0xFFFFFFFF
+    return f"{len(df)}:{df['datetime'].max()}:{checksum:08x}"
+
+
+def records(frame):
+    """``frame`` with its index as a column, as JSON-ready dicts: ISO dates, floats to two decimals."""
+    return json.loads(frame.reset_index().to_json(orient="records", date_format="iso", double_precision=2))
+
+
+def _favorite(counts, labels, index):
+    # Matches Series.mode(): the most common value, ties going to the smallest one.
+    counts = counts[:, :len(labels)]
+    if not counts.shape[1]:
+        return pd.Series(np.nan, index=index)
+    favorite = pd.Series(np.asarray(labels.take(counts.argmax(axis=1)), dtype=object), index=index)
+    return favorite.where(counts.max(axis=1) > 0)
+
+
+def streak_runs(df):
+    """Every run of consecutive drinking days as ``person, start, end, length`` rows."""
+    logged = df.loc[df["datetime"].notna(), ["person", "datetime"]]
+    codes, people = pd.factorize(logged["person"])
+    days = logged["datetime"].to_numpy().astype("datetime64[D]").astype(np.int64)
+
+    # Pack (player, day) into one integer key so a single 1-D unique sorts and dedupes both.
+    first_day = days.min() if len(days) else 0
+    span = days.max() - first_day + 2 if len(days) else 1
+    keys = np.unique(codes * span + (days - first_day))
+    return _runs(keys // span, keys % span + first_day, people)
+
+
+def _runs(codes, days, people):
+    # ``codes`` and ``days`` are unique player/day pairs sorted by player, then day.
+    new_run = np.ones(len(days), dtype=bool)
+    new_run[1:] = (codes[1:] != codes[:-1]) | (np.diff(days) != 1)
+    starts = np.flatnonzero(new_run)
+    ends = np.append(starts[1:] - 1, len(days) - 1)[:len(starts)]
+
+    return pd.DataFrame({
+        "person": people.take(codes[starts]) if len(starts) else pd.Index([], dtype=object),
+        "start": days[starts].astype("datetime64[D]"),
+        "end": days[ends].astype("datetime64[D]"),
+        "length": ends - starts + 1
+    })
+
+
+def compute_streaks(df, today=None, runs=None):
+    """Current and longest streak for every player from a single batch of runs.
+
+    The current streak counts back from today, or from yesterday if nothing
+    has been logged yet today.
+    """
+    if today is None:
+        today = datetime.now().date()
+    if runs is None:
+        runs = streak_runs(df)
+
+    today = np.datetime64(today, "D")
+    yesterday = today - 1
+    covers_today = (runs["start"] <= today) & (runs["end"] >= today)
+    covers_yesterday = (runs["start"] <= yesterday) & (runs["end"] >= yesterday)
+
+    from_today = runs[covers_today].set_index("person")["start"].rsub(today).dt.days + 1
+    from_yesterday = runs[covers_yesterday].set_index("person")["start"].rsub(yesterday).dt.days + 1
+
+    grouped = runs.groupby("person")["length"]
+    streaks = pd.DataFrame({"longest_streak": grouped.max()})
+    streaks["current_streak"] = from_today.combine_first(from_yesterday).reindex(streaks.index).fillna(0)
+    return streaks.astype(int)[["current_streak", "longest_streak"]]
+
+
+def player_summary(df, people=None, today=None, year=2026, forecast=None, cube=None):
+    """Per-player stats for the cards, read off a ``DrinkCube`` of ``df``.
+
+    ``cube`` and ``forecast`` take a prebuilt cube and precomputed year-end
+    predictions (see ``tracker.forecast``); without them they're built from
+    ``df`` for season ``year``.
+    """
+    if people is None:
+        people = df["person"].dropna().unique().tolist()
+    if today is None:
+        today = datetime.now().date()
+
+    if df.empty:
+        summary = pd.DataFrame(index=pd.Index(people, name="person"), columns=SUMMARY_COLUMNS)
+        summary = summary.fillna(SUMMARY_DEFAULTS)
+        return summary.astype(object).where(summary.notna(), None)
+
+    if cube is None:
+        cube = DrinkCube(df, year)
+    index = pd.CategoricalIndex(cube.people, name="person")
+    drinks, ounces = cube.sums("person")
+    totals = pd.DataFrame({"total_drinks": drinks, "total_ounces": ounces}, index=index)
+
+    by_type, _ = cube.sums("person", "drink_type")
+    diet_coke = np.append(pd.Index(cube.drink_types.astype(str)).str.lower().str.contains("diet coke"), False)
+    totals["pct_diet_coke"] = np.divide(by_type[:, diet_coke].sum(axis=1), drinks, out=np.zeros(len(drinks)), where=drinks > 0) * 100
+    answers = df["first_beverage"].astype("category")
+    said_yes = np.append(answers.cat.categories.astype(str).str.lower().str.contains("yes"), False)
+    first_beverage = pd.Series(said_yes[answers.cat.codes.to_numpy()], index=df.index)
+    totals["first_beverage_pct"] = first_beverage.groupby(df["person"], observed=True).mean() * 100
+
+    daily_drinks, daily_ounces = cube.sums("person", "date")
+    days_active = (daily_drinks > 0).sum(axis=1)
+    totals["days_active"] = days_active
+    # A window outside the cube's season leaves no days on its date axis.
+    totals["max_drinks_one_day"] = daily_drinks.max(axis=1, initial=0)
+    totals["max_ounces_one_day"] = daily_ounces.max(axis=1, initial=0)
+    if daily_drinks.shape[1]:
+        totals["max_drinks_date"] = pd.Series(cube.labels("date").take(daily_drinks.argmax(axis=1)), index=index).where(days_active > 0)
+    else:
+        totals["max_drinks_date"] = pd.NaT
+
+    totals["favorite_format"] = _favorite(cube.sums("person", "format")[0], cube.formats, index)
+    totals["favorite_hour"] = _favorite(cube.sums("person", "hour")[0], cube.labels("hour"), index)
+
+    totals["avg_daily_drinks"] = np.divide(drinks, days_active, out=np.zeros(len(drinks)), where=days_active > 0)
+
+    # From the rows rather than the cube, whose date axis stops at the season's edges.
+    streaks = compute_streaks(df, today)
+    totals["current_streak"] = streaks["current_streak"]
+    totals["longest_streak"] = streaks["longest_streak"]
+    # A windowed cube keeps every player on its axis, including any with nothing in the window.
+    totals = totals[totals["total_drinks"] > 0]
+
+    if forecast is None:
+        forecast = forecast_year_end(df, today, year)
+    totals = totals.join(forecast[FORECAST_COLUMNS])
+
+    summary = totals[SUMMARY_COLUMNS].reindex(pd.Index(people, name="person"))
+    summary = summary.fillna(SUMMARY_DEFAULTS)
+    return summary.astype(object).where(summary.notna(), None)
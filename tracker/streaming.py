@@ -0,0 +1,173 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from tracker.aggregates import CHART_MAX_POINTS, cumulative_ounces
+from tracker.downsample import downsample_series
+from tracker.schema import DTYPES
+
+COUNT_COLUMNS = {
+    "hourly": "hour",
+    "daily": "day_of_week",
+    "format_counts": "format",
+    "drink_type_counts": "drink_type"
+}
+
+
+def _add(total, batch):
+    return batch if total is None else total.add(batch, fill_value=0)
+
+
+def _earliest(first_seen, batch):
+    # Each player's first row in time order, ties going to the earlier row, which is the order ``unique()`` sees.
+    if first_seen is not None:
+        batch = pd.concat([first_seen, batch])
+    batch = batch.sort_values(["datetime", "row"], na_position="last")
+    return batch[~batch.index.duplicated()]
+
+
+def _keyed(grouped):
+    # Plain object keys so batches with different categories line up when added together.
+    index = grouped.index
+    if isinstance(index, pd.MultiIndex):
+        grouped.index = pd.MultiIndex.from_arrays(
+            [index.get_level_values(level).astype(object) for level in range(index.nlevels)],
+            names=index.names
+        )
+    else:
+        grouped.index = index.astype(object)
+    return grouped
+
+
+def _frame(keyed, columns):
+    frame = keyed.reset_index()
+    frame = frame.astype({col: DTYPES[col] for col in columns if col in DTYPES})
+    return frame.sort_values(columns, ignore_index=True)
+
+
+class StreamingAggregates:
+    """The dashboard tables, kept current by folding in appended rows batch by batch.
+
+    Every table is held as totals keyed by value and player, so ``update``
+    only groups the new rows. ``tables()`` returns the same dict as
+    ``dashboard_aggregates`` over everything folded so far; only the
+    cumulative series has to be re-sorted, and only when a batch arrives out
+    of time order.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self._totals = None
+        self._first_seen = None
+        self._daily = None
+        self._counts = dict.fromkeys(COUNT_COLUMNS)
+        self._chunks = []
+        self._running = {}
+        self._last_time = None
+        self._in_order = True
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def update(self, batch):
+        with self._lock:
+            self._update(batch)
+        return self
+
+    def _update(self, batch):
+        if batch is None or batch.empty:
+            return
+        first_seen = pd.DataFrame({
+            "datetime": batch["datetime"].to_numpy(),
+            "row": np.arange(self.rows, self.rows + len(batch))
+        }, index=batch["person"].astype(object))
+        self._first_seen = _earliest(self._first_seen, first_seen[first_seen.index.notna()])
+        self.rows += len(batch)
+        self._tables = {}
+
+        by_person = batch.groupby("person", observed=True)
+        self._totals = _add(self._totals, _keyed(by_person.agg(
+            total_drinks=("person", "size"),
+            total_ounces=("ounces", "sum")
+        ).astype(float)))
+
+        self._daily = _add(self._daily, _keyed(batch.groupby(["date", "person"], observed=True).agg(
+            drinks=("person", "size"),
+            ounces=("ounces", "sum")
+        ).astype(float)))
+        for name, column in COUNT_COLUMNS.items():
+            counts = _keyed(batch.groupby([column, "person"], observed=True).size().rename("count"))
+            self._counts[name] = _add(self._counts[name], counts)
+
+        rows = batch[["datetime", "person", "ounces"]]
+        times = rows["datetime"]
+        if times.hasnans or (self._last_time is not None and times.min() < self._last_time):
+            self._in_order = False
+        if self._in_order:
+            rows = rows.sort_values("datetime", kind="stable")
+            offset = rows["person"].astype(object).map(self._running).fillna(0).to_numpy()
+            rows = rows.assign(cumulative_ounces=rows.groupby("person", observed=True)["ounces"].cumsum() + offset)
+            latest = rows.drop_duplicates("person", keep="last")
+            self._running.update(zip(latest["person"].astype(object), latest["cumulative_ounces"]))
+        self._chunks.append(rows)
+        if not times.isna().all():
+            self._last_time = max(times.max(), self._last_time) if self._last_time is not None else times.max()
+
+    def _cumulative(self):
+        rows = pd.concat(self._chunks, ignore_index=True)
+        if self._in_order:
+            return rows
+        return cumulative_ounces(rows.drop(columns="cumulative_ounces", errors="ignore"))
+
+    def tables(self, goal_ounces=None):
+        with self._lock:
+            if goal_ounces not in self._tables:
+                self._tables[goal_ounces] = self._build(goal_ounces)
+            return self._tables[goal_ounces]
+
+    def _build(self, goal_ounces):
+        if self._totals is None:
+            return None
+        board = self._totals.sort_index()
+        days_active = self._daily.index.get_level_values("person").value_counts()
+        board["total_drinks"] = board["total_drinks"].astype(int)
+        board["avg_daily_drinks"] = board["total_drinks"] / days_active.reindex(board.index)
+        board.index.name = "person"
+
+        daily_trends = _frame(self._daily, ["date", "person"])
+        daily_trends["drinks"] = daily_trends["drinks"].astype(int)
+
+        tables = {
+            "people": self._first_seen.index.tolist(),
+            "leaderboard": board.sort_values("total_drinks", ascending=False),
+            "daily_trends": daily_trends,
+            "cumulative": downsample_series(
+                self._cumulative(), "datetime", "cumulative_ounces", "person",
+                CHART_MAX_POINTS, keep_level=goal_ounces
+            )
+        }
+        for name, column in COUNT_COLUMNS.items():
+            counts = _frame(self._counts[name], [column, "person"])
+            counts["count"] = counts["count"].astype(int)
+            tables[name] = counts
+        return tables
+
+    @classmethod
+    def combine(cls, states):
+        """A new state holding everything folded into ``states``."""
+        combined = cls()
+        for state in states:
+            with state._lock:
+                if state._totals is None:
+                    continue
+                combined._first_seen = _earliest(
+                    combined._first_seen, state._first_seen.assign(row=state._first_seen["row"] + combined.rows)
+                )
+                combined.rows += state.rows
+                combined._totals = _add(combined._totals, state._totals)
+                combined._daily = _add(combined._daily, state._daily)
+                for name in COUNT_COLUMNS:
+                    combined._counts[name] = _add(combined._counts[name], state._counts[name])
+                combined._chunks.extend(state._chunks)
+        combined._in_order = len(combined._chunks) == 0
+        return combined
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+RANGE_PRESETS = ["All time", "Last 7 days", "Last 30 days", "This month", "Custom"]
+
+
+def sort_by_time(df):
+    return df.sort_values("datetime", kind="stable", na_position="last", ignore_index=True)
+
+
+def season_day(season, today):
+    """The day a season's date ranges end on: ``today``, or the season's last day once it's over."""
+    return min(pd.Timestamp(today).date(), pd.Timestamp(season, 12, 31).date())
+
+
+def preset_bounds(preset, today):
+    """``(start, end)`` dates for a named range ending today; ``None`` means unbounded."""
+    today = pd.Timestamp(today).normalize()
+    if preset == "Last 7 days":
+        return (today - pd.Timedelta(days=6)).date(), today.date()
+    if preset == "Last 30 days":
+        return (today - pd.Timedelta(days=29)).date(), today.date()
+    if preset == "This month":
+        return today.replace(day=1).date(), today.date()
+    return None, None
+
+
+class TimeIndex:
+    """Slices a frame sorted by ``datetime`` into date windows with binary search instead of a mask scan."""
+
+    def __init__(self, df):
+        if not df["datetime"].is_monotonic_increasing or df["datetime"].hasnans:
+            df = sort_by_time(df)
+        self.df = df
+        times = df["datetime"].to_numpy()
+        self.times = times[:len(times) - int(np.isnat(times).sum())]
+
+    def bounds(self, start=None, end=None):
+        """Row positions ``[i, j)`` covering whole days from ``start`` through ``end``."""
+        i = 0 if start is None else int(np.searchsorted(self.times, np.datetime64(start, "D"), side="left"))
+        if end is None:
+            j = len(self.times)
+        else:
+            j = int(np.searchsorted(self.times, np.datetime64(end, "D") + 1, side="left"))
+        return i, j
+
+    def window(self, start=None, end=None):
+        if start is None and end is None:
+            return self.df
+        i, j = self.bounds(start, end)
+        return self.df.iloc[i:j]